@@ -0,0 +1,49 @@
+"""Non-blocking HTTP requests for asyncio tasks.
+
+Wraps `adafruit_requests.Session.start_request`: the pending request is stepped
+and the task yields to the event loop in between, so a slow server only delays
+the task waiting for it. DNS lookup and connect are still blocking.
+"""
+
+import asyncio
+import errno
+
+# How long to yield between steps of a pending request
+POLL_INTERVAL = 0.01
+
+
+class AsyncSession:
+    """Awaitable requests over an adafruit_requests.Session"""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def request(self, method, url, headers=None, timeout=60, stream=False):
+        """Returns the finished PendingRequest (status_code, headers, content, json()),
+        raising OSError(ETIMEDOUT) if it takes longer than timeout seconds. With stream
+        it returns once the headers are in, the body is then read through `collect`."""
+        pending = self._session.start_request(
+            method, url, headers=headers, timeout=timeout, stream=stream
+        )
+        while not pending.step():
+            await asyncio.sleep(POLL_INTERVAL)
+        return pending
+
+    async def get(self, url, headers=None, timeout=60, stream=False):
+        return await self.request("GET", url, headers=headers, timeout=timeout, stream=stream)
+
+    async def collect(self, items):
+        """List of what items yields, items being an iterator over a streamed
+        PendingRequest that can resume after its readinto raised EAGAIN, like
+        FieldReader(pending, keys, resumable=True). The task yields while nothing
+        has arrived."""
+        collected = []
+        while True:
+            try:
+                collected.append(next(items))
+            except StopIteration:
+                return collected
+            except OSError as exc:
+                if exc.errno != errno.EAGAIN:
+                    raise
+                await asyncio.sleep(POLL_INTERVAL)
@@ -0,0 +1,2 @@
+"""Host-side benchmarks: a local CoinGecko stand-in (fakegecko) and the HTTP
+benchmark suite that runs adafruit_requests against it (http_bench)."""
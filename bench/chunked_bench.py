@@ -0,0 +1,105 @@
+"""Chunked transfer decoding in Response._readinto against the chunk size.
+
+The bench fixture, in its own process, sends the markets body in chunks of
+each size; the client reads it through ``Response.raw`` into one reused
+buffer, like FieldReader does, so what is measured is the chunk framing::
+
+    python -m bench.chunked_bench --chunk-sizes 16 64 256 4096 --per-page 100
+
+Reported per chunk size: body MB/s, the chunks in a body, and peak KB
+tracemalloc saw allocated while one body was read. Only the body is timed,
+not the request and headers. Every body is checked against the fixture's
+own payload.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (os.path.join(ROOT, "lib"), ROOT):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import adafruit_connection_manager
+import adafruit_requests
+
+from bench.fakegecko import FakeGecko
+
+READ_SIZE = 256  # What the client asks _readinto for at a time
+
+
+def read_body(response, buf):
+    """Reads the body through raw into buf, returns its length"""
+    length = 0
+    while True:
+        read = response.raw.readinto(buf)
+        if not read:
+            return length
+        length += read
+
+
+def run(server, path, requests, memory_requests):
+    """Returns (MB/s, peak KB while reading one body)"""
+    session = adafruit_requests.Session(socket)
+    url = f"http://{server.host}:{server.port}{path}"
+    buf = bytearray(READ_SIZE)
+    try:
+        expected = json.dumps(server.markets({"per_page": path.rsplit("=", 1)[-1]})).encode()
+        response = session.get(url)
+        body = bytearray()
+        while True:
+            read = response.raw.readinto(buf)
+            if not read:
+                break
+            body += memoryview(buf)[:read]
+        if body != expected:
+            raise AssertionError(f"body differs with {server.chunk_size} byte chunks")
+        response.close()
+
+        elapsed = 0.0
+        for _ in range(requests):
+            response = session.get(url)
+            started = time.perf_counter()
+            read_body(response, buf)
+            elapsed += time.perf_counter() - started
+            response.close()
+
+        peaks = []
+        tracemalloc.start()
+        for _ in range(memory_requests):
+            response = session.get(url)
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            read_body(response, buf)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            response.close()
+        tracemalloc.stop()
+    finally:
+        adafruit_connection_manager.connection_manager_close_all(socket)
+    return len(expected) * requests / elapsed / 1e6, sorted(peaks)[len(peaks) // 2] / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench.chunked_bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[16, 64, 256, 1024, 4096])
+    parser.add_argument("--per-page", type=int, default=100, help="coins in the markets body")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--memory-requests", type=int, default=5)
+    args = parser.parse_args()
+
+    path = f"/api/v3/coins/markets?vs_currency=usd&per_page={args.per_page}"
+    print(f"{'chunk':>7}{'chunks':>8}{'MB/s':>9}{'peak KB':>9}")
+    for chunk_size in args.chunk_sizes:
+        with FakeGecko(chunked=True, chunk_size=chunk_size).start(process=True) as server:
+            length = len(json.dumps(server.markets({"per_page": str(args.per_page)})))
+            throughput, peak = run(server, path, args.requests, args.memory_requests)
+            print(f"{chunk_size:>7}{-(-length // chunk_size):>8}{throughput:>9.2f}{peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
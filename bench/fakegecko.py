@@ -0,0 +1,347 @@
+"""Local stand-in for the CoinGecko endpoints the ticker uses.
+
+Serves ``/api/v3/coins/markets`` and ``/api/v3/simple/price`` over HTTP/1.1
+with CoinGecko-shaped payloads for a fixed, seeded list of coins, and can
+misbehave on purpose: added latency, chunked instead of Content-Length bodies,
+no keep-alive, a 429 every few requests and bodies dripped out slowly. With
+``gzip`` it compresses bodies for clients that send Accept-Encoding.
+
+    with FakeGecko(chunked=True, latency=0.02) as server:
+        url = f"http://{server.host}:{server.port}/api/v3/simple/price?ids=bitcoin&vs_currencies=usd"
+
+``python -m bench.fakegecko --port 8000`` serves it for the simulator.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import multiprocessing
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# What stats counts: connections, requests and responses per status
+_COUNTERS = ("connections", "requests", 200, 304, 404, 429)
+
+_NAMES = (
+    ("bitcoin", "btc", "Bitcoin"),
+    ("ethereum", "eth", "Ethereum"),
+    ("tether", "usdt", "Tether"),
+    ("binancecoin", "bnb", "BNB"),
+    ("solana", "sol", "Solana"),
+    ("usd-coin", "usdc", "USDC"),
+    ("ripple", "xrp", "XRP"),
+    ("staked-ether", "steth", "Lido Staked Ether"),
+    ("dogecoin", "doge", "Dogecoin"),
+    ("the-open-network", "ton", "Toncoin"),
+    ("cardano", "ada", "Cardano"),
+    ("avalanche-2", "avax", "Avalanche"),
+    ("shiba-inu", "shib", "Shiba Inu"),
+    ("wrapped-bitcoin", "wbtc", "Wrapped Bitcoin"),
+    ("polkadot", "dot", "Polkadot"),
+    ("chainlink", "link", "Chainlink"),
+    ("tron", "trx", "TRON"),
+    ("bitcoin-cash", "bch", "Bitcoin Cash"),
+    ("near", "near", "NEAR Protocol"),
+    ("matic-network", "matic", "Polygon"),
+)
+
+
+def make_coins(count=250, seed=1):
+    """count coins shaped like /coins/markets entries, the same for the same seed"""
+    rng = random.Random(seed)
+    coins = []
+    price = 70000.0
+    for rank in range(1, count + 1):
+        if rank <= len(_NAMES):
+            coin_id, symbol, name = _NAMES[rank - 1]
+        else:
+            coin_id, symbol, name = f"coin-{rank}", f"c{rank}", f"Coin {rank}"
+        supply = rng.uniform(1e6, 1e11)
+        coins.append({
+            "id": coin_id,
+            "symbol": symbol,
+            "name": name,
+            "image": f"https://assets.coingecko.com/coins/images/{rank}/large/{coin_id}.png",
+            "current_price": round(price, 6),
+            "market_cap": int(price * supply),
+            "market_cap_rank": rank,
+            "fully_diluted_valuation": int(price * supply * 1.2),
+            "total_volume": int(price * supply * rng.uniform(0.01, 0.2)),
+            "high_24h": round(price * 1.03, 6),
+            "low_24h": round(price * 0.97, 6),
+            "price_change_24h": round(price * rng.uniform(-0.05, 0.05), 6),
+            "price_change_percentage_24h": round(rng.uniform(-5, 5), 5),
+            "market_cap_change_24h": round(price * supply * rng.uniform(-0.05, 0.05), 1),
+            "market_cap_change_percentage_24h": round(rng.uniform(-5, 5), 5),
+            "circulating_supply": round(supply, 1),
+            "total_supply": round(supply * 1.1, 1),
+            "max_supply": None if rank % 3 else round(supply * 1.5, 1),
+            "ath": round(price * 1.4, 6),
+            "ath_change_percentage": round(rng.uniform(-90, 0), 5),
+            "ath_date": "2024-03-14T07:10:36.635Z",
+            "atl": round(price * 0.01, 6),
+            "atl_change_percentage": round(rng.uniform(100, 90000), 5),
+            "atl_date": "2013-07-06T00:00:00.000Z",
+            "roi": None if rank % 4 else {"times": 64.9, "currency": "btc", "percentage": 6490.5},
+            "last_updated": "2024-03-25T08:45:01.129Z",
+        })
+        price *= rng.uniform(0.5, 0.98)
+    return coins
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in one write, flushed after each response
+    wbufsize = 64 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        # The server adds no delays of its own, only the configured ones
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.fixture.count("connections")
+
+    def do_GET(self):
+        fixture = self.server.fixture
+        number = fixture.count("requests")
+        if fixture.latency:
+            time.sleep(fixture.latency)
+
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if fixture.rate_limit_every and number % fixture.rate_limit_every == 0:
+            self._reply(429, {"status": {"error_code": 429, "error_message": "You've exceeded the Rate Limit."}},
+                        {"Retry-After": "60"})
+        elif url.path == "/api/v3/coins/markets":
+            self._reply(200, fixture.markets(query))
+        elif url.path == "/api/v3/simple/price":
+            self._reply(200, fixture.prices(query))
+        else:
+            self._reply(404, {"error": "Not found"})
+
+    def _reply(self, status, payload, headers=None):
+        fixture = self.server.fixture
+        fixture.count(status)
+        body = json.dumps(payload).encode("utf-8")
+        etag = None
+        if fixture.etag and status == 200:
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                fixture.count(304)
+                status, body = 304, b""
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if etag:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body and fixture.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, mtime=0)
+            self.send_header("Content-Encoding", "gzip")
+        if not fixture.keep_alive:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        chunked = fixture.chunked and status != 304
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if chunked:
+            for start in range(0, len(body), fixture.chunk_size):
+                chunk = body[start : start + fixture.chunk_size]
+                self._write(b"%x\r\n" % len(chunk) + chunk + b"\r\n")
+            self._write(b"0\r\n\r\n")
+        else:
+            self._write(body)
+
+    def _write(self, data):
+        fixture = self.server.fixture
+        if not fixture.drip_bytes:
+            self.wfile.write(data)
+            return
+        for start in range(0, len(data), fixture.drip_bytes):
+            self.wfile.write(data[start : start + fixture.drip_bytes])
+            self.wfile.flush()
+            time.sleep(fixture.drip_delay)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-response is part of the tests
+        pass
+
+
+class FakeGecko:
+    """The server, run between `start` and `stop` on a background thread or,
+    with ``start(process=True)``, in a forked process that keeps its
+    allocations out of the caller's tracemalloc numbers.
+
+    ``latency`` seconds pass before each response, ``chunked`` bodies are sent
+    in ``chunk_size`` chunks, without ``keep_alive`` every response closes its
+    connection, every ``rate_limit_every``-th request gets a 429, with
+    ``drip_bytes`` the body is written that many bytes at a time
+    ``drip_delay`` seconds apart, and with ``etag`` an If-None-Match with the
+    current ETag gets a 304. With ``gzip`` bodies are gzip compressed for
+    requests that accept it. ``stats`` counts connections, requests and
+    responses per status code.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        chunked=False,
+        chunk_size=1024,
+        keep_alive=True,
+        rate_limit_every=0,
+        drip_bytes=0,
+        drip_delay=0.001,
+        etag=False,
+        gzip=False,
+        coin_count=250,
+    ):
+        self.latency = latency
+        self.chunked = chunked
+        self.chunk_size = chunk_size
+        self.keep_alive = keep_alive
+        self.rate_limit_every = rate_limit_every
+        self.drip_bytes = drip_bytes
+        self.drip_delay = drip_delay
+        self.etag = etag
+        self.gzip = gzip
+        self.coins = make_coins(coin_count)
+        self._by_id = {coin["id"]: coin for coin in self.coins}
+        # Shared memory, so the counts survive the fork in process mode
+        self._counts = multiprocessing.Array("q", len(_COUNTERS))
+        self._server = _Server((host, port), _Handler)
+        self._server.fixture = self
+        self._thread = None
+        self._process = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def stats(self):
+        with self._counts.get_lock():
+            return {key: count for key, count in zip(_COUNTERS, self._counts) if count}
+
+    def count(self, key):
+        index = _COUNTERS.index(key)
+        with self._counts.get_lock():
+            self._counts[index] += 1
+            return self._counts[index]
+
+    def reset_stats(self):
+        with self._counts.get_lock():
+            for index in range(len(_COUNTERS)):
+                self._counts[index] = 0
+
+    def markets(self, query):
+        if "ids" in query:
+            wanted = query["ids"].split(",")
+            coins = [coin for coin in self.coins if coin["id"] in wanted]
+        else:
+            coins = self.coins
+        per_page = min(int(query.get("per_page", 100)), 250)
+        page = int(query.get("page", 1))
+        return coins[(page - 1) * per_page : page * per_page]
+
+    def prices(self, query):
+        prices = {}
+        for coin_id in query.get("ids", "").split(","):
+            coin = self._by_id.get(coin_id)
+            if coin is None:
+                continue
+            price = {"usd": coin["current_price"]}
+            if query.get("include_24hr_change") == "true":
+                price["usd_24h_change"] = coin["price_change_percentage_24h"]
+            if query.get("include_last_updated_at") == "true":
+                price["last_updated_at"] = 1711356301
+            prices[coin_id] = price
+        return prices
+
+    def start(self, process=False):
+        if process:
+            context = multiprocessing.get_context("fork")
+            self._process = context.Process(target=self._server.serve_forever, daemon=True)
+            self._process.start()
+        else:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        else:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+
+    def __enter__(self):
+        if self._thread is None and self._process is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench.fakegecko", description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--chunked", action="store_true", help="send chunked bodies")
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--no-keep-alive", action="store_true", help="close the connection after each response")
+    parser.add_argument("--rate-limit-every", type=int, default=0, metavar="N", help="answer every Nth request with 429")
+    parser.add_argument("--drip-bytes", type=int, default=0, help="write bodies this many bytes at a time")
+    parser.add_argument("--drip-delay", type=float, default=0.001, help="seconds between drips")
+    parser.add_argument("--etag", action="store_true", help="send ETags and answer If-None-Match with 304")
+    parser.add_argument("--gzip", action="store_true", help="gzip bodies if the client accepts it")
+    args = parser.parse_args()
+
+    server = FakeGecko(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        chunked=args.chunked,
+        chunk_size=args.chunk_size,
+        keep_alive=not args.no_keep_alive,
+        rate_limit_every=args.rate_limit_every,
+        drip_bytes=args.drip_bytes,
+        drip_delay=args.drip_delay,
+        etag=args.etag,
+        gzip=args.gzip,
+    )
+    print(f"Serving on http://{server.host}:{server.port}/api/v3/")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""End-to-end benchmark of adafruit_requests against the local CoinGecko stand-in.
+
+Each scenario starts a `FakeGecko` with some behaviour, then fetches one url
+through ``adafruit_requests.Session`` (and ``adafruit_connection_manager``) over
+CPython's socket module, reading the body the way the ticker does. Reported:
+
+- req/s and p50/p99 latency of a timed pass;
+- peak KB: the most memory tracemalloc saw allocated during one request, above
+  what was allocated before it (a separate, slower pass, median of requests);
+- reuse: share of requests that went out on an already open socket;
+- non-200: responses with another status (429s, 304s).
+
+The numbers are for comparing the HTTP stack before and after a change on the
+same machine, not for predicting the device::
+
+    python -m bench.http_bench --requests 300 --only price
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (os.path.join(ROOT, "lib"), ROOT):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import adafruit_connection_manager
+import adafruit_requests
+from json_fields import FieldReader
+
+from bench.fakegecko import FakeGecko
+
+PRICE_PATH = (
+    "/api/v3/simple/price?vs_currencies=usd&include_24hr_change=true&include_last_updated_at=true"
+    "&ids=bitcoin,ethereum,solana,ripple,dogecoin"
+)
+MARKETS_PATH = "/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=25&page=1"
+MARKET_FIELDS = ("id", "symbol", "name", "market_cap_rank")
+
+# name, FakeGecko options, path, how the body is read, validator cache size
+SCENARIOS = (
+    ("price", {}, PRICE_PATH, "json", 0),
+    ("price-chunked", {"chunked": True, "chunk_size": 64}, PRICE_PATH, "json", 0),
+    ("price-close", {"keep_alive": False}, PRICE_PATH, "json", 0),
+    ("price-latency", {"latency": 0.02}, PRICE_PATH, "json", 0),
+    ("price-429", {"rate_limit_every": 5}, PRICE_PATH, "json", 0),
+    ("price-etag", {"etag": True}, PRICE_PATH, "json", 2),
+    ("price-pending", {}, PRICE_PATH, "pending", 0),
+    ("markets", {}, MARKETS_PATH, "fields", 0),
+    ("markets-json", {}, MARKETS_PATH, "json", 0),
+    ("markets-chunked", {"chunked": True, "chunk_size": 512}, MARKETS_PATH, "fields", 0),
+    ("markets-drip", {"drip_bytes": 1460, "drip_delay": 0.0005}, MARKETS_PATH, "fields", 0),
+    ("markets-gzip", {"gzip": True}, MARKETS_PATH, "fields", 0),
+    ("markets-gzip-json", {"gzip": True}, MARKETS_PATH, "json", 0),
+    ("markets-gzip-chunked", {"gzip": True, "chunked": True, "chunk_size": 512}, MARKETS_PATH, "fields", 0),
+)
+
+WARMUP = 3
+
+
+def fetch(session, url, read):
+    """One request, body read the way the ticker reads it"""
+    if read == "pending":
+        pending = session.start_request("GET", url)
+        while not pending.step():
+            pass
+        return pending.status_code, pending.json()
+
+    response = session.get(url)
+    status = response.status_code
+    if read == "fields" and status == 200:
+        body = list(FieldReader(response.raw, MARKET_FIELDS))
+    elif status == 304 or read == "json":
+        body = response.json()
+    else:
+        body = response.content
+    response.close()
+    return status, body
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+def run_scenario(scenario, requests, memory_requests):
+    name, options, path, read, cache_size = scenario
+    # The server runs in its own process so tracemalloc only sees the client
+    with FakeGecko(**options).start(process=True) as server:
+        url = f"http://{server.host}:{server.port}{path}"
+        # Against a gzip server the session asks for compressed bodies
+        session = adafruit_requests.Session(
+            socket, validator_cache_size=cache_size, decompress=options.get("gzip", False)
+        )
+        try:
+            for _ in range(WARMUP):
+                fetch(session, url, read)
+
+            server.reset_stats()
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(requests):
+                request_started = time.perf_counter()
+                fetch(session, url, read)
+                latencies.append(time.perf_counter() - request_started)
+            elapsed = time.perf_counter() - started
+            stats = dict(server.stats)
+
+            peaks = []
+            tracemalloc.start()
+            for _ in range(memory_requests):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                fetch(session, url, read)
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            tracemalloc.stop()
+        finally:
+            adafruit_connection_manager.connection_manager_close_all(socket)
+
+    served = stats.get("requests", 0)
+    return {
+        "scenario": name,
+        "requests_per_s": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_kb": percentile(peaks, 50) / 1024 if peaks else 0.0,
+        "reuse": 1 - stats.get("connections", 0) / served if served else 0.0,
+        "non_200": served - stats.get(200, 0) + stats.get(304, 0),
+    }
+
+
+def print_table(results):
+    print(f"{'scenario':<18}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'peak KB':>9}{'reuse':>8}{'non-200':>9}")
+    for result in results:
+        print(
+            f"{result['scenario']:<18}{result['requests_per_s']:>9.1f}{result['p50_ms']:>9.2f}"
+            f"{result['p99_ms']:>9.2f}{result['peak_kb']:>9.1f}{result['reuse']:>8.0%}{result['non_200']:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench.http_bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per scenario")
+    parser.add_argument("--memory-requests", type=int, default=20, help="requests traced for memory per scenario")
+    parser.add_argument("--only", action="append", default=[], metavar="TEXT",
+                        help="run the scenarios whose name contains TEXT")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH")
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not args.only or any(text in s[0] for text in args.only)]
+    results = []
+    for scenario in scenarios:
+        results.append(run_scenario(scenario, args.requests, args.memory_requests))
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Checks that button presses are handled within a bound while the network stalls.
+
+The simulator runs code.py on the wall clock against the bench fixture, with
+every response held back ``--stall`` seconds. With no saved selection the
+ticker boots into the selection screen; BUTTON0 is then pressed every 100 ms,
+which keeps the network task fetching catalogue pages from the stalled
+server. Each press and release must reach the app within ``--bound`` ms of
+being due, or the check fails::
+
+    python -m bench.input_latency --stall 2 --bound 50
+
+With ``--chunked`` and ``--drip`` the bodies come chunked, ``--drip`` bytes
+every 100 ms, so pages are left mid-body when the selection changes; boot
+then takes longer, raise ``--seconds``. Events due before the event loop
+started are skipped: boot is blocking. The host's own scheduling delays count
+too, so long runs on a busy or virtual machine can fail without the app
+blocking.
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench.fakegecko import FakeGecko
+from sim import Simulator
+
+PRESS_INTERVAL = 0.1
+DRIP_DELAY = 0.1
+
+
+def run(stall, seconds, chunked=False, drip=0):
+    """Returns (latencies in ms of the events due after boot, requests served)"""
+    with FakeGecko(latency=stall, chunked=chunked, drip_bytes=drip, drip_delay=DRIP_DELAY) as server:
+        simulator = Simulator(hosts={"api.coingecko.com": (server.host, server.port)}, real_time=True)
+        for i in range(int(seconds / PRESS_INTERVAL)):
+            simulator.press(0, at=i * PRESS_INTERVAL, hold=PRESS_INTERVAL / 2)
+        simulator.run(hours=seconds / 3600)
+        requests = server.stats.get("requests", 0)
+
+    keypad = simulator.modules["keypad"]
+    booted = simulator.ticker.boot_times[-1][1] - keypad.epoch
+    return [(handed - due) * 1000 for due, handed in keypad.delivered if due >= booted], requests
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench.input_latency", description=__doc__.split("\n")[0])
+    parser.add_argument("--stall", type=float, default=2.0, help="seconds the server holds each response")
+    parser.add_argument("--bound", type=float, default=50.0, help="ms an event may wait to be handled")
+    parser.add_argument("--seconds", type=float, default=12.0, help="real seconds to run, boot included")
+    parser.add_argument("--chunked", action="store_true", help="send bodies chunked")
+    parser.add_argument("--drip", type=int, default=0, help="send bodies this many bytes per 100 ms")
+    args = parser.parse_args()
+
+    latencies, requests = run(args.stall, args.seconds, args.chunked, args.drip)
+    if not latencies or requests < 2:
+        sys.exit("FAIL: no presses after boot or no request during them, raise --seconds")
+    latencies.sort()
+    worst = latencies[-1]
+    print(f"{len(latencies)} events during {requests - 1} stalled page requests: "
+          f"p50 {latencies[len(latencies) // 2]:.1f} ms, max {worst:.1f} ms")
+    if worst > args.bound:
+        sys.exit(f"FAIL: an event waited {worst:.1f} ms, over {args.bound:.0f} ms")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
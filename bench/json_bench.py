@@ -0,0 +1,128 @@
+"""Response.json parse throughput against its socket buffer size.
+
+CPython's ``json.load`` reads the whole stream with one ``read()``, while
+CircuitPython's pulls 64 bytes at a time through ``readinto``. To see what the
+buffer size does on the device, the decoder used here reads like
+CircuitPython's (then parses with ``json.loads``). The server is the bench
+fixture in its own process; a counting socket pool tells how many
+``recv_into`` calls each request took::
+
+    python -m bench.json_bench --sizes 0 64 512 2048 --per-page 100
+
+Size 0 is the unbuffered ``Response.raw``. Every body is also checked against
+the fixture's own payload, with and without chunked transfer encoding.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (os.path.join(ROOT, "lib"), ROOT):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import adafruit_connection_manager
+import adafruit_requests
+
+from bench.fakegecko import FakeGecko
+
+DECODER_READ = 64  # What CircuitPython's json.load asks its stream for
+
+
+class DeviceJson:
+    """Stands in for the json module inside adafruit_requests, reading like CircuitPython"""
+
+    def __init__(self):
+        self._chunk = bytearray(DECODER_READ)
+
+    def load(self, stream):
+        data = bytearray()
+        while True:
+            read = stream.readinto(self._chunk)
+            if not read:
+                break
+            data += memoryview(self._chunk)[:read]
+        return json.loads(data)
+
+    loads = staticmethod(json.loads)
+    dumps = staticmethod(json.dumps)
+
+
+class _CountingSocket:
+    def __init__(self, pool, sock):
+        self._pool = pool
+        self._socket = sock
+
+    def recv_into(self, buffer, nbytes=0):
+        self._pool.recv_calls += 1
+        return self._socket.recv_into(buffer, nbytes)
+
+    def __getattr__(self, name):
+        return getattr(self._socket, name)
+
+
+class CountingPool:
+    """The socket module, counting recv_into calls on the sockets it makes"""
+
+    SOCK_STREAM = socket.SOCK_STREAM
+
+    def __init__(self):
+        self.recv_calls = 0
+
+    @staticmethod
+    def getaddrinfo(*args):
+        return socket.getaddrinfo(*args)
+
+    def socket(self, *args):
+        return _CountingSocket(self, socket.socket(*args))
+
+
+def run(server, path, buffer_size, requests):
+    """Parses the body requests times, returns (MB/s, recv_into calls per request)"""
+    pool = CountingPool()
+    session = adafruit_requests.Session(pool, json_buffer_size=buffer_size)
+    url = f"http://{server.host}:{server.port}{path}"
+    expected = server.markets({"per_page": path.rsplit("=", 1)[-1]})
+    try:
+        response = session.get(url)
+        if response.json() != expected:
+            raise AssertionError(f"body differs with a {buffer_size} byte buffer")
+        length = len(json.dumps(expected))
+
+        # Only the body is timed, not the request and headers
+        pool.recv_calls = 0
+        elapsed = 0.0
+        for _ in range(requests):
+            response = session.get(url)
+            started = time.perf_counter()
+            response.json()
+            elapsed += time.perf_counter() - started
+    finally:
+        adafruit_connection_manager.connection_manager_close_all(pool)
+    return length * requests / elapsed / 1e6, pool.recv_calls / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench.json_bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 64, 128, 256, 512, 1024, 2048, 4096],
+                        help="json_buffer_size values to compare")
+    parser.add_argument("--per-page", type=int, default=100, help="coins in the markets body")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    adafruit_requests.json_module = DeviceJson()
+    path = f"/api/v3/coins/markets?vs_currency=usd&per_page={args.per_page}"
+    print(f"{'transfer':<10}{'buffer':>8}{'MB/s':>9}{'recv/req':>10}")
+    for name, options in (("length", {}), ("chunked", {"chunked": True, "chunk_size": 1000})):
+        with FakeGecko(**options).start(process=True) as server:
+            for size in args.sizes:
+                throughput, calls = run(server, path, size, args.requests)
+                print(f"{name:<10}{size:>8}{throughput:>9.2f}{calls:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
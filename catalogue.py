@@ -0,0 +1,98 @@
+"""Coin catalogue fetched a page at a time from /coins/markets"""
+
+
+class Catalogue:
+    """The top ``size`` coins by market cap as a sliding window of pages.
+
+    Positions are 0 based, page numbers 1 based like the API's ``page`` parameter.
+    Only the cursor's page, up to ``behind`` pages before it and the page after
+    it stay in memory; `wanted_page` says which page to fetch next so the one
+    after the cursor is there before the cursor reaches it.
+
+    Pages can be stored as stale (e.g. an old copy from flash): they are shown
+    as they are, and fetched again once nothing is missing.
+    """
+
+    def __init__(self, per_page=25, size=250, behind=1, margin=5):
+        self.per_page = per_page
+        self.size = size
+        self.behind = behind
+        self.margin = margin  # Prefetch once the cursor is this close to a page's end
+        self._pages = {}  # Page number -> list of coins
+        self._stale = set()  # Loaded pages that should be fetched again
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def page_count(self):
+        return (self.size + self.per_page - 1) // self.per_page
+
+    def page_of(self, position):
+        return position // self.per_page + 1
+
+    def get(self, position):
+        """The coin at position, None if its page isn't loaded"""
+        page = self._pages.get(self.page_of(position))
+        if page is None:
+            return None
+        offset = position % self.per_page
+        return page[offset] if offset < len(page) else None
+
+    def store(self, page, coins, position, stale=False):
+        """Adds a fetched page, then drops the pages out of the window around position.
+        A short page marks the end of the catalogue."""
+        if len(coins) < self.per_page:
+            self.size = min(self.size, (page - 1) * self.per_page + len(coins))
+        if coins:
+            self._pages[page] = coins
+        if stale:
+            self._stale.add(page)
+        else:
+            self._stale.discard(page)
+        self.trim(position)
+
+    def _in_window(self, page, cursor):
+        distance = (page - cursor) % self.page_count
+        return distance <= 1 or distance >= self.page_count - self.behind
+
+    def trim(self, position):
+        if not self.size:
+            self.clear()
+            return
+        cursor = self.page_of(position)
+        for page in list(self._pages):
+            if not self._in_window(page, cursor):
+                del self._pages[page]
+                self._stale.discard(page)
+
+    def clear(self):
+        self._pages = {}
+        self._stale = set()
+
+    def _needed(self, position):
+        """The cursor's page, and the following one (wrapping around to the first)
+        once the cursor is within margin of the end of its page"""
+        cursor = self.page_of(position)
+        ahead = self.page_of((position + self.margin) % self.size)
+        return (cursor,) if ahead == cursor else (cursor, ahead)
+
+    def missing_page(self, position):
+        """Page the cursor at position needs that isn't loaded, None if there is none"""
+        if not self.size:
+            return None
+        for page in self._needed(position):
+            if page not in self._pages:
+                return page
+        return None
+
+    def wanted_page(self, position):
+        """Next page to fetch for the cursor at position: a missing one first, then a
+        stale one. None if there is nothing to fetch."""
+        page = self.missing_page(position)
+        if page is not None or not self.size:
+            return page
+        for page in self._needed(position):
+            if page in self._stale:
+                return page
+        return None
@@ -0,0 +1,68 @@
+"""Catalogue pages kept on flash, one file per page, so selecting needs no download.
+
+Layout (little endian)::
+
+    header  4s magic, B version, B per_page, B coin count, I saved at (time.time())
+    coin    H rank (0 if unknown), B id length, B symbol length, B name length,
+            then the utf-8 id, symbol and name
+"""
+
+import os
+import struct
+
+_MAGIC = b"CCAT"
+_VERSION = 1
+_HEADER = "<4sBBBI"
+_COIN = "<HBBB"
+
+
+def page_path(directory, page):
+    return f"{directory}/page{page}.bin"
+
+
+def save(directory, page, per_page, coins, saved_at):
+    """Writes one page of coins (dicts with id/symbol/name/rank)"""
+    try:
+        os.mkdir(directory)
+    except OSError:
+        pass  # Already there
+    with open(page_path(directory, page), "wb") as f:
+        f.write(struct.pack(_HEADER, _MAGIC, _VERSION, per_page, len(coins), int(saved_at)))
+        for coin in coins:
+            coin_id = coin["id"].encode("utf-8")[:255]
+            symbol = coin["symbol"].encode("utf-8")[:255]
+            name = coin["name"].encode("utf-8")[:255]
+            f.write(struct.pack(_COIN, coin.get("rank") or 0, len(coin_id), len(symbol), len(name)))
+            f.write(coin_id)
+            f.write(symbol)
+            f.write(name)
+
+
+def load(directory, page, per_page):
+    """Reads a page back as (coins, saved_at). Raises OSError if it isn't cached and
+    ValueError (struct.error on CPython) if it is unreadable or was saved with
+    another page size."""
+    with open(page_path(directory, page), "rb") as f:
+        data = f.read()
+    magic, version, saved_per_page, count, saved_at = struct.unpack_from(_HEADER, data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Unknown catalogue cache format")
+    if saved_per_page != per_page:
+        raise ValueError("Catalogue cache has another page size")
+    offset = struct.calcsize(_HEADER)
+    coin_size = struct.calcsize(_COIN)
+
+    coins = []
+    for _ in range(count):
+        rank, id_length, symbol_length, name_length = struct.unpack_from(_COIN, data, offset)
+        offset += coin_size
+        coin_id = str(data[offset:offset + id_length], "utf-8")
+        offset += id_length
+        symbol = str(data[offset:offset + symbol_length], "utf-8")
+        offset += symbol_length
+        name = str(data[offset:offset + name_length], "utf-8")
+        offset += name_length
+        coins.append({"id": coin_id, "symbol": symbol, "name": name, "rank": rank or None, "color": 0x00FF00})
+    if offset != len(data):
+        raise ValueError("Truncated or corrupt catalogue cache")
+    return coins, saved_at
@@ -1,26 +1,45 @@
-import json
+import sys
 import time
 import gc
+import asyncio
 import board
-import digitalio
 import displayio
+import keypad
 import wifi
+import supervisor
 import socketpool
 import adafruit_requests
+from async_http import AsyncSession
+from json_fields import FieldReader
+from catalogue import Catalogue
+import catalogue_cache
+from price_history import PriceHistory
+from coin_screen import CoinScreen, ScreenCache
+from price_text import DigitSheet
+from scheduler import Scheduler
+import snapshot
+import selection
+from heap_stats import HeapStats
+from latency_stats import LatencyStats
+from refresh_coordinator import RefreshCoordinator
 from adafruit_display_text import label
 import terminalio
 
+BOOT_START = time.monotonic()
+
 # Display Config
 WIDTH = 320
 HEIGHT = 170
 
-button0 = digitalio.DigitalInOut(board.BUTTON0)
-button0.direction = digitalio.Direction.INPUT
-button0.pull = digitalio.Pull.UP
+# Buttons are scanned and debounced in the background, key 0 is BUTTON0
+buttons = keypad.Keys((board.BUTTON0, board.BUTTON1), value_when_pressed=False, pull=True)
+# How often the input task checks the event queue. A press waits up to this long plus
+# the longest step another task takes; 40 ms keeps that under 50 ms with 25 wake-ups a
+# second, where the old loop woke 10 times a second.
+INPUT_POLL_INTERVAL = 0.04
 
-button1 = digitalio.DigitalInOut(board.BUTTON1)
-button1.direction = digitalio.Direction.INPUT
-button1.pull = digitalio.Pull.UP
+# Changes made within one frame share a single display refresh
+TARGET_FPS = 20
 
 display = board.DISPLAY
 
@@ -31,60 +50,282 @@ WIFI_PASSWORD = "CHANGE-FOR-YOUR-PASSWORD"
 # CoinGecko API
 MARKET_API_URL = "http://api.coingecko.com/api/v3/coins/markets"
 PRICE_API_URL = "http://api.coingecko.com/api/v3/simple/price"
+# Only these fields are kept from each /coins/markets entry
+MARKET_FIELDS = ("id", "symbol", "name", "market_cap_rank")
+# Ask for gzip bodies, 5-8x less to receive. Off: CircuitPython's zlib can't stream,
+# the session then never asks for them, and where it can the 32 KB inflate window
+# costs more RAM than FieldReader saves on /coins/markets.
+DECOMPRESS = False
+
+# The selection screen offers the top CATALOGUE_SIZE coins, fetched
+# CATALOGUE_PAGE at a time as the user scrolls. Only a few pages stay in RAM.
+CATALOGUE_SIZE = 250
+CATALOGUE_PAGE = 25
+# Fetched catalogue pages are kept on flash and shown straight from there, pages
+# older than CATALOGUE_TTL seconds are fetched again in the background
+CATALOGUE_CACHE_DIR = "/catalogue"
+CATALOGUE_TTL = 24 * 60 * 60
+# Most coins that can be selected, each gets a price history slot
+MAX_SELECTED = 20
+
+# Price history: one sample per price update, 120 x 5 min = 10 hours.
+# Memory is fixed at HISTORY_SAMPLES * MAX_SELECTED coins * 4 bytes (9.6 KB).
+HISTORY_SAMPLES = 120
+
+# Cached coin screens are dropped, least recently shown first, below this free heap
+SCREEN_CACHE_MIN_FREE = 32 * 1024
+
+# Last coin list and prices, shown at power-on before the network is up
+SNAPSHOT_PATH = "/snapshot.bin"
+
+# Selected coin ids, the JSON list of older versions is migrated on first boot
+SELECTION_PATH = "/selected_coins.bin"
+LEGACY_SELECTION_PATH = "/selected_coins.json"
+
+# Heap use per phase, printed after boot and whenever "m" is typed on the
+# serial console (see handle_serial). Off, each phase boundary is one method call.
+HEAP_STATS = False
+HEAP_PHASES = ("fetch_coins", "fetch_prices", "json", "coin_display", "selection")
+FETCH_COINS, FETCH_PRICES, PARSE_JSON, COIN_DISPLAY, SELECTION_SCREEN = range(len(HEAP_PHASES))
 
-try:
-    import json
-    with open("/selected_coins.json", "r") as f:
-        SAVED_COINS = json.load(f)
-except:
-    SAVED_COINS = []
+# Latency histograms, always recorded, printed whenever "t" is typed on the
+# serial console. The first five are recorded by adafruit_requests.
+LATENCY_STAGES = ("connect", "send", "ttfb", "body", "json", "layout", "refresh")
 
 class CryptoTicker:
     def __init__(self):
         self.current_coin_index = 0
         self.last_update = 0
-        self.last_coin_change = 0
         self.update_interval = 300  # Interval to Update Price 300 seconds
         self.coin_change_interval = 10  # Change coin every 10 seconds
+        self.status_interval = 5  # Refresh "Last Update" every 5 seconds
+        self.scheduler = Scheduler()
+        self.heap = HeapStats(HEAP_PHASES, enabled=HEAP_STATS)
+        self.latency = LatencyStats(LATENCY_STAGES)
+        self.frames = RefreshCoordinator(self.refresh_display, target_fps=TARGET_FPS)
+        self.button_event = keypad.Event()  # Reused for every button event
+        self.wake = asyncio.Event()  # Render task: schedule changed or redraw wanted
+        self.render_pending = False
+        self.network_wanted = asyncio.Event()  # Network task: fetch prices or catalogue pages now
         self.prices = {}
-        self.available_coins = []  # List of all available coins
+        self.history = PriceHistory(HISTORY_SAMPLES, max_coins=MAX_SELECTED)
+        self.catalogue = Catalogue(per_page=CATALOGUE_PAGE, size=CATALOGUE_SIZE)
         self.selected_coins = []  # List of selected coins
+        self.selection = selection.Selection(max_count=MAX_SELECTED)  # Selection over the catalogue
+        self.selection.reset(len(self.catalogue), self.load_selected_ids())
         self.is_selection_mode = True  # Start in selection mode
         self.main_group = displayio.Group()
         self.is_display_rotated = True
-        self.button_press_start = None
+        self.screens = ScreenCache(self.build_coin_screen, min_free=SCREEN_CACHE_MIN_FREE)
+        self.coin_screen = None  # CoinScreen last shown
+        self.selection_group = None  # Built on first use, then reused
+        self.status_label = None  # Status messages, built by setup_display
+        self.name_bar = displayio.Bitmap(WIDTH, 30, 1)  # Shared by every CoinScreen
+        self.digits = DigitSheet(terminalio.FONT)  # Price characters, also shared
+        self.warm_boot = False  # Prices from the snapshot are on screen
+        self.boot_times = []
         display.rotation = 180
+        # Frames only go out through self.frames, not whenever displayio sees a change
+        display.auto_refresh = False
         self.setup_display()
+        self.mark_boot("display")
+        self.load_snapshot()
+        self.mark_boot("snapshot")
         self.connect_wifi()
+        self.mark_boot("wifi")
         self.setup_requests()
+        self.mark_boot("requests")
+
+    def mark_boot(self, phase):
+        self.boot_times.append((phase, time.monotonic()))
+
+    def print_boot_times(self):
+        print("Boot time breakdown:")
+        last = BOOT_START
+        for phase, at in self.boot_times:
+            print(f"  {phase:<10} {(at - last) * 1000:6.0f} ms")
+            last = at
+        print(f"  {'total':<10} {(last - BOOT_START) * 1000:6.0f} ms")
+
+    def load_snapshot(self):
+        """Shows the last known prices from flash while the network comes up"""
+        try:
+            coins, selected_ids, prices, saved_at = snapshot.load(SNAPSHOT_PATH)
+        except Exception as e:
+            print(f"No snapshot loaded: {e}")
+            return False
+
+        # The snapshot holds the selected coins, by rank
+        for rank, coin in enumerate(coins, 1):
+            coin["rank"] = rank
+        if not self.selection.count:
+            self.selection.reset(len(self.catalogue), selected_ids)
+        self.selection.add_coins(coins)
+        self.selected_coins = self.selection.selected_coins()
+        self.prices = prices
+        print(f"Snapshot loaded: {len(coins)} coins, saved at {saved_at}")
+        if not self.selected_coins or not self.prices:
+            return False
+
+        self.warm_boot = True
+        self.is_selection_mode = False
+        self.create_coin_display()
+        return True
+
+    def save_snapshot(self):
+        try:
+            selected_ids = [coin["id"] for coin in self.selected_coins]
+            snapshot.save(SNAPSHOT_PATH, self.selected_coins, selected_ids, self.prices, time.time())
+        except Exception as e:
+            print(f"Error saving snapshot: {e}")
         
-    def fetch_top_coins(self):
+    def market_url(self, query):
+        return f"{MARKET_API_URL}?vs_currency=usd&order=market_cap_desc&{query}"
+
+    def read_coins(self, stream):
+        """Coins of a /coins/markets body, streamed so only MARKET_FIELDS are kept
+        instead of parsing ~30 fields per coin into dicts"""
+        started = self.latency.start()
+        coins = [self.coin_from_fields(fields) for fields in FieldReader(stream, MARKET_FIELDS)]
+        self.latency.stop("json", started)
+        return coins
+
+    async def read_coins_async(self, response):
+        """read_coins for a streamed PendingRequest, other tasks run while the body arrives"""
+        fields = await self.http.collect(FieldReader(response, MARKET_FIELDS, resumable=True))
+        return [self.coin_from_fields(coin_fields) for coin_fields in fields]
+
+    def coin_from_fields(self, fields):
+        coin_id, symbol, name, rank = fields
+        return {
+            "id": coin_id,
+            "symbol": symbol.upper(),
+            "name": name,
+            "rank": rank,
+            "color": 0x00FF00
+        }
+
+    def page_url(self, page):
+        return self.market_url(f"per_page={self.catalogue.per_page}&page={page}")
+
+    def store_page(self, page, coins, stale=False):
+        self.catalogue.store(page, coins, self.current_coin_index, stale)
+        self.selection.add_coins(coins, (page - 1) * self.catalogue.per_page)
+        if self.current_coin_index >= len(self.catalogue):
+            self.current_coin_index = 0
+        print(f"Catalogue page {page}: {len(coins)} coins{' (stale)' if stale else ''}")
+
+    def save_cached_page(self, page, coins):
+        if not coins:
+            return
         try:
-            print("Getting top 20 coins...")
-            params = {
-                "vs_currency": "usd",
-                "order": "market_cap_desc",
-                "per_page": 20,
-                "page": 1,
-                "sparkline": False
-            }
-            url = f"{MARKET_API_URL}?vs_currency={params['vs_currency']}&order={params['order']}&per_page={params['per_page']}&page={params['page']}"
-            response = self.requests.get(url)
+            catalogue_cache.save(CATALOGUE_CACHE_DIR, page, CATALOGUE_PAGE, coins, time.time())
+        except Exception as e:
+            print(f"Error caching coins page {page}: {e}")
+
+    def load_cached_pages(self):
+        """Fills in the pages the cursor needs from flash. Those older than
+        CATALOGUE_TTL are stored as stale and fetched again in the background.
+        Returns True if the cursor's page is loaded."""
+        page = self.catalogue.missing_page(self.current_coin_index)
+        while page is not None:
+            try:
+                coins, saved_at = catalogue_cache.load(CATALOGUE_CACHE_DIR, page, CATALOGUE_PAGE)
+            except Exception:
+                break
+            # Without a synced clock time.time() restarts at every boot, so a
+            # negative age can't be trusted either
+            age = time.time() - saved_at
+            self.store_page(page, coins, stale=not 0 <= age < CATALOGUE_TTL)
+            page = self.catalogue.missing_page(self.current_coin_index)
+        return self.catalogue.get(self.current_coin_index) is not None
+
+    def fetch_page(self, page):
+        """Loads one catalogue page, blocking. Used at boot, later pages come from
+        the network task (fetch_wanted_pages)"""
+        self.heap.begin(FETCH_COINS)
+        try:
+            print(f"Getting coins page {page}...")
+            response = self.requests.get(self.page_url(page))
+            self.heap.sample()
             
             if response.status_code == 200:
-                coins = response.json()
-                self.available_coins = [{
-                    "id": coin["id"],
-                    "symbol": coin["symbol"].upper(),
-                    "name": coin["name"],
-                    "color": 0x00FF00
-                } for coin in coins]
+                coins = self.read_coins(response.raw)
+                self.store_page(page, coins)
+                self.save_cached_page(page, coins)
+                return True
+            else:
+                print(f"API Error: Status {response.status_code}")
+                return False
                 
-                if SAVED_COINS:
-                    self.selected_coins = [coin for coin in self.available_coins 
-                                         if coin["id"] in SAVED_COINS]
+        except Exception as e:
+            print(f"Error fetching coins: {str(e)}")
+            self.update_status_text(f"Error: {str(e)}")
+            return False
+        finally:
+            self.heap.end(FETCH_COINS)
 
-                print(f"Found {len(self.available_coins)} coins")
+    async def fetch_page_async(self, page):
+        # Phases of the other tasks run while this one waits, and count here too
+        self.heap.begin(FETCH_COINS)
+        try:
+            print(f"Getting coins page {page}...")
+            # Streamed: the body goes through FieldReader's buffer, never held whole
+            response = await self.http.get(self.page_url(page), stream=True)
+            try:
+                # Confirmed while the page was on its way, nothing to show it on
+                if not self.is_selection_mode:
+                    return False
+                if response.status_code == 200:
+                    coins = await self.read_coins_async(response)
+                    self.heap.sample()
+            finally:
+                response.close()
+            if response.status_code == 200:
+                self.store_page(page, coins)
+                self.save_cached_page(page, coins)
+                return True
+            else:
+                print(f"API Error: Status {response.status_code}")
+                return False
+
+        except Exception as e:
+            print(f"Error fetching coins: {str(e)}")
+            return False
+        finally:
+            self.heap.end(FETCH_COINS)
+            gc.collect()
+
+    async def fetch_wanted_pages(self):
+        """Fetches the page under the cursor and the next one, if missing or stale"""
+        page = self.catalogue.wanted_page(self.current_coin_index)
+        while page is not None and self.is_selection_mode:
+            if not await self.fetch_page_async(page):
+                break
+            # The cursor may be on "Loading..." waiting for this page
+            self.request_render()
+            page = self.catalogue.wanted_page(self.current_coin_index)
+
+    def want_pages(self):
+        """Loads the pages the cursor needs soon from flash, wakes the network
+        task for the rest and for stale ones"""
+        self.load_cached_pages()
+        if self.catalogue.wanted_page(self.current_coin_index) is not None:
+            self.network_wanted.set()
+
+    def fetch_selected_coins(self):
+        """Details of the saved selection, wherever the coins are in the catalogue"""
+        self.heap.begin(FETCH_COINS)
+        try:
+            print("Getting selected coins...")
+            coin_ids = ",".join(self.selection.selected_ids())
+            response = self.requests.get(self.market_url(f"ids={coin_ids}&per_page={self.selection.count}"))
+            self.heap.sample()
+            
+            if response.status_code == 200:
+                self.selection.add_coins(self.read_coins(response.raw))
+                self.selected_coins = self.selection.selected_coins()
+                print(f"Found {len(self.selected_coins)} coins")
                 return True
             else:
                 print(f"API Error: Status {response.status_code}")
@@ -92,28 +333,31 @@ class CryptoTicker:
                 
         except Exception as e:
             print(f"Error fetching coins: {str(e)}")
-            self.update_status_text(f"Error: {str(e)}")
+            if not self.warm_boot:
+                self.update_status_text(f"Error: {str(e)}")
             return False
+        finally:
+            self.heap.end(FETCH_COINS)
+
+    def load_selected_ids(self):
+        try:
+            return selection.load_ids(SELECTION_PATH, LEGACY_SELECTION_PATH)
+        except Exception:
+            return []
 
     def save_selected_coins(self):
         try:
-            selected_ids = [coin["id"] for coin in self.selected_coins]
-            with open("/selected_coins.json", "w") as f:
-                json.dump(selected_ids, f)
+            selected_ids = self.selection.selected_ids()
+            selection.save_ids(SELECTION_PATH, selected_ids)
             print("Coins saved successfully!")
             return True
         except Exception as e:
             print(f"Error saving coins: {str(e)}")
             return False
 
-    def show_selection_screen(self):
-        while len(self.main_group) > 1:
-            self.main_group.pop()
-            
-        coin = self.available_coins[self.current_coin_index]
-        is_selected = any(sc["id"] == coin["id"] for sc in self.selected_coins)
-        
-        info_group = displayio.Group()
+    def setup_selection_screen(self):
+        """Builds the selection screen once, only its coin fields change afterwards"""
+        self.selection_group = displayio.Group()
         
         title_text = label.Label(
             terminalio.FONT,
@@ -123,47 +367,47 @@ class CryptoTicker:
             anchor_point=(0.5, 0.0),
             anchored_position=(WIDTH//2, 10)
         )
-        info_group.append(title_text)
+        self.selection_group.append(title_text)
         
-        counter_text = label.Label(
+        self.selection_counter_text = label.Label(
             terminalio.FONT,
-            text=f"({self.current_coin_index + 1}/{len(self.available_coins)})",
+            text="",
             scale=1,
             color=0x888888,
             anchor_point=(0.5, 0.0),
             anchored_position=(WIDTH//2, 35)
         )
-        info_group.append(counter_text)
+        self.selection_group.append(self.selection_counter_text)
         
-        symbol_text = label.Label(
+        self.selection_symbol_text = label.Label(
             terminalio.FONT,
-            text=coin["symbol"],
+            text="",
             scale=4,
             color=0xFFFFFF,
             anchor_point=(0.5, 0.5),
             anchored_position=(WIDTH//2, HEIGHT//2 - 15)
         )
-        info_group.append(symbol_text)
+        self.selection_group.append(self.selection_symbol_text)
         
-        name_text = label.Label(
+        self.selection_name_text = label.Label(
             terminalio.FONT,
-            text=coin["name"],
+            text="",
             scale=2,
             color=0xFFFFFF,
             anchor_point=(0.5, 0.5),
             anchored_position=(WIDTH//2, HEIGHT//2 + 20)
         )
-        info_group.append(name_text)
+        self.selection_group.append(self.selection_name_text)
         
-        status_text = label.Label(
+        self.selection_status_text = label.Label(
             terminalio.FONT,
-            text="[OK]" if is_selected else "[ ]",
+            text="",
             scale=1,
-            color=0x00FF00 if is_selected else 0xFF0000,
+            color=0xFF0000,
             anchor_point=(0.5, 1.0),
             anchored_position=(WIDTH//2, HEIGHT - 40)
         )
-        info_group.append(status_text)
+        self.selection_group.append(self.selection_status_text)
         
         instructions_text = label.Label(
             terminalio.FONT,
@@ -173,20 +417,43 @@ class CryptoTicker:
             anchor_point=(0.5, 1.0),
             anchored_position=(WIDTH//2, HEIGHT - 10)
         )
-        info_group.append(instructions_text)
+        self.selection_group.append(instructions_text)
+
+    def show_selection_screen(self):
+        self.heap.begin(SELECTION_SCREEN)
+        started = self.latency.start()
+        if self.selection_group is None:
+            self.setup_selection_screen()
+            
+        coin = self.catalogue.get(self.current_coin_index)
         
-        self.main_group.append(info_group)
-        display.refresh()
+        self.selection_counter_text.text = f"({self.current_coin_index + 1}/{len(self.catalogue)})"
+        if coin is None:
+            # Its page is still being fetched, shown once it arrives
+            self.selection_symbol_text.text = "..."
+            self.selection_name_text.text = "Loading..."
+            self.selection_status_text.text = ""
+        else:
+            is_selected = self.selection.is_selected(self.current_coin_index)
+            self.selection_symbol_text.text = coin["symbol"]
+            self.selection_name_text.text = coin["name"]
+            self.selection_status_text.text = "[OK]" if is_selected else "[ ]"
+            self.selection_status_text.color = 0x00FF00 if is_selected else 0xFF0000
+        
+        self.show_group(self.selection_group)
+        self.latency.stop("layout", started)
+        self.frames.invalidate()
+        self.heap.end(SELECTION_SCREEN)
 
     def toggle_current_coin(self):
-        coin = self.available_coins[self.current_coin_index]
-        # If already selected, remove
-        if any(sc["id"] == coin["id"] for sc in self.selected_coins):
-            self.selected_coins = [sc for sc in self.selected_coins if sc["id"] != coin["id"]]
-        # If not selected, add
-        else:
-            self.selected_coins.append(coin)
-        self.show_selection_screen()
+        coin = self.catalogue.get(self.current_coin_index)
+        if coin is None:
+            return
+        if not self.selection.is_selected(self.current_coin_index) and self.selection.count >= MAX_SELECTED:
+            print(f"At most {MAX_SELECTED} coins can be selected")
+            return
+        self.selection.toggle(self.current_coin_index, coin)
+        self.request_render()
         
     def setup_display(self):
         display.root_group = self.main_group
@@ -197,7 +464,7 @@ class CryptoTicker:
         background_sprite = displayio.TileGrid(background, pixel_shader=background_palette)
         self.main_group.append(background_sprite)
         
-        loading_text = label.Label(
+        self.status_label = label.Label(
             terminalio.FONT,
             text="Connecting to WiFi...",
             scale=3,
@@ -205,60 +472,80 @@ class CryptoTicker:
             anchor_point=(0.5, 0.5),
             anchored_position=(WIDTH//2, HEIGHT//2)
         )
-        self.main_group.append(loading_text)
-        display.refresh()
+        self.main_group.append(self.status_label)
+        self.frames.invalidate()
         
     def connect_wifi(self):
         try:
             print(f"Connecting to WiFi: {WIFI_SSID}")
             wifi.radio.connect(WIFI_SSID, WIFI_PASSWORD)
             print(f"Connected! IP: {wifi.radio.ipv4_address}")
-            
-            self.update_status_text("WiFi Connected!")
-            time.sleep(1)
+
+            # Keep the cached prices on screen instead of status messages
+            if not self.warm_boot:
+                self.update_status_text("WiFi Connected!")
+                time.sleep(1)
             
         except Exception as e:
             print(f"Error connecting to WiFi: {e}")
-            self.update_status_text("WiFi Error!")
-            time.sleep(2)
+            if not self.warm_boot:
+                self.update_status_text("WiFi Error!")
+                time.sleep(2)
     
     def setup_requests(self):
         import ssl
         self.pool = socketpool.SocketPool(wifi.radio)
         ssl_context = ssl.create_default_context()
-        self.requests = adafruit_requests.Session(self.pool, ssl_context)
+        # Remember ETag/Last-Modified of the price and market urls, unchanged
+        # bodies then come back as a 304 and are served from the cache
+        self.requests = adafruit_requests.Session(
+            self.pool, ssl_context, validator_cache_size=2, timings=self.latency,
+            decompress=DECOMPRESS,
+        )
+        # Used by the network task once the run loop is up, never blocks the UI
+        self.http = AsyncSession(self.requests)
         
     def update_status_text(self, text):
-        if len(self.main_group) > 1:
-            self.main_group.pop()
-        
-        status_text = label.Label(
-            terminalio.FONT,
-            text=text,
-            scale=3,
-            color=0xFFFFFF,
-            anchor_point=(0.5, 0.5),
-            anchored_position=(WIDTH//2, HEIGHT//2)
-        )
-        self.main_group.append(status_text)
-        display.refresh()
+        # Same label every time, only the area its text covers is redrawn
+        self.status_label.text = text
+        self.show_group(self.status_label)
+        self.frames.invalidate()
         
+    def prices_url(self):
+        coin_ids = ",".join(coin["id"] for coin in self.selected_coins)
+        print(f"Fetching prices for: {coin_ids}")
+        return f"{PRICE_API_URL}?vs_currencies=usd&include_24hr_change=true&include_last_updated_at=true&ids={coin_ids}"
+
+    def apply_prices(self, prices, changed=True):
+        self.prices = prices
+        self.last_update = time.monotonic()
+        self.record_history()
+        if changed:
+            self.save_snapshot()
+        print("Prices updated successfully!")
+
+    def read_json(self, response):
+        self.heap.begin(PARSE_JSON)
+        try:
+            return response.json()
+        finally:
+            self.heap.end(PARSE_JSON)
+
     def fetch_prices(self):
+        self.heap.begin(FETCH_PRICES)
         try:
             if not self.selected_coins:
                 return False
                 
-            coin_ids = ",".join(coin["id"] for coin in self.selected_coins)
-            url = f"{PRICE_API_URL}?vs_currencies=usd&include_24hr_change=true&ids={coin_ids}"
+            url = self.prices_url()
             print("API URL:", url)
 
-            print(f"Fetching prices for: {coin_ids}")
             response = self.requests.get(url)
+            self.heap.sample()
             
-            if response.status_code == 200:
-                self.prices = response.json()
-                self.last_update = time.monotonic()
-                print("Prices updated successfully!")
+            # 304: prices unchanged, json() returns the cached ones
+            if response.status_code in (200, 304):
+                self.apply_prices(self.read_json(response), response.status_code == 200)
                 return True
             else:
                 print(f"API Error: Status {response.status_code}")
@@ -266,206 +553,283 @@ class CryptoTicker:
                 
         except Exception as e:
             print(f"Error fetching prices: {str(e)}")
-            self.update_status_text(f"Error: {str(e)}")
+            if not self.warm_boot:
+                self.update_status_text(f"Error: {str(e)}")
             return False
         finally:
+            self.heap.end(FETCH_PRICES)
             gc.collect()
             
-    def format_price(self, price):
-        return f"${price:,.2f}"
+    async def fetch_prices_async(self):
+        """fetch_prices for the network task, other tasks keep running meanwhile"""
+        self.heap.begin(FETCH_PRICES)
+        try:
+            if not self.selected_coins:
+                return False
+
+            response = await self.http.get(self.prices_url())
+            self.heap.sample()
+            # 304: prices unchanged, json() returns the cached ones
+            if response.status_code in (200, 304):
+                self.apply_prices(self.read_json(response), response.status_code == 200)
+                return True
+            else:
+                print(f"API Error: Status {response.status_code}")
+                return False
+
+        except Exception as e:
+            print(f"Error fetching prices: {str(e)}")
+            return False
+        finally:
+            self.heap.end(FETCH_PRICES)
+            gc.collect()
+
+    def record_history(self):
+        selected_ids = [coin["id"] for coin in self.selected_coins]
+        self.history.track(selected_ids)
+        self.screens.keep(selected_ids)
+        for coin in self.selected_coins:
+            usd_price = self.prices.get(coin["id"], {}).get("usd")
+            if usd_price is not None:
+                self.history.append(coin["id"], usd_price)
+
+    def format_price(self, price, columns):
+        text = f"${price:,.2f}"
+        # Cents don't fit once prices reach six digits
+        return text if len(text) <= columns else f"${price:,.0f}"
             
+    def build_coin_screen(self, coin):
+        print(f"Building screen for {coin['id']} ({len(self.screens)} cached)")
+        return CoinScreen(coin, WIDTH, HEIGHT, self.name_bar, self.digits, self.history)
+
+    def refresh_display(self):
+        """Pushes the changes to the panel, called by self.frames once per frame"""
+        started = self.latency.start()
+        display.refresh()
+        self.latency.stop("refresh", started)
+
+    def show_group(self, group):
+        """Puts group on screen above the background, if it isn't already there"""
+        if len(self.main_group) > 1 and self.main_group[-1] is group:
+            return
+        while len(self.main_group) > 1:
+            self.main_group.pop()
+        self.main_group.append(group)
+
     def create_coin_display(self):
-        """Creates display for current coin"""
+        """Updates the coin screen for current coin"""
+        self.heap.begin(COIN_DISPLAY)
+        try:
+            self.update_coin_display()
+        finally:
+            self.heap.end(COIN_DISPLAY)
+
+    def update_coin_display(self):
         if not self.selected_coins:
             self.update_status_text("No coin selected")
             return
 
-        # Clear current display
-        while len(self.main_group) > 1:
-            self.main_group.pop()
-            
         coin = self.selected_coins[self.current_coin_index]
         coin_data = self.prices.get(coin["id"], {})
-        
+
         if not coin_data:
             self.update_status_text("Loading prices...")
             return
-            
+
         usd_price = coin_data.get("usd", 0)
         change_24h = coin_data.get("usd_24h_change", 0)
-        
-        # Grupo principal da moeda
-        coin_group = displayio.Group()
-        
-        # Barra superior com nome da moeda
-        name_bg = displayio.Bitmap(WIDTH, 30, 1)
-        name_palette = displayio.Palette(1)
-        name_palette[0] = coin["color"]
-        name_bg_sprite = displayio.TileGrid(name_bg, pixel_shader=name_palette)
-        coin_group.append(name_bg_sprite)
-        
-        name_text = label.Label(
-            terminalio.FONT,
-            text=f"{coin['name']} ({coin['symbol']})",
-            scale=2,
-            color=0x000000,
-            anchor_point=(0.5, 0.5),
-            anchored_position=(WIDTH//2, 15)
-        )
-        coin_group.append(name_text)
-        
-        usd_text = label.Label(
-            terminalio.FONT,
-            text=self.format_price(usd_price),
-            scale=5, 
-            color=0x00FF00,
-            anchor_point=(0.5, 0.5),
-            anchored_position=(WIDTH//2, HEIGHT//2)
-        )
-        coin_group.append(usd_text)
-        
+
+        started = self.latency.start()
+        screen = self.screens.get(coin)
+
+        # Only text and colors change: price and change rewrite the tiles of the
+        # characters that differ, labels skip the re-layout if text is the same
+        screen.usd_text.text = self.format_price(usd_price, screen.usd_text.columns)
+
         arrow = "+" if change_24h >= 0 else "-"
-        change_color = 0x00FF00 if change_24h >= 0 else 0xFF0000
-        change_text = label.Label(
-            terminalio.FONT,
-            text=f"{arrow}{abs(change_24h):.2f}%",
-            scale=3,
-            color=change_color,
-            anchor_point=(0.5, 1.0),
-            anchored_position=(WIDTH//2, HEIGHT - 20)
-        )
-        coin_group.append(change_text)
-        
-        counter_text = label.Label(
-            terminalio.FONT,
-            text=f"{self.current_coin_index + 1}/{len(self.selected_coins)}",
-            scale=1,
-            color=0x888888,
-            anchor_point=(1.0, 0.0),
-            anchored_position=(WIDTH - 5, 35)
-        )
-        coin_group.append(counter_text)
-        
-        update_text = label.Label(
-            terminalio.FONT,
-            text=f"Last Update: {int(time.monotonic() - self.last_update)}s",
-            scale=1,
-            color=0x888888,
-            anchor_point=(0.0, 0.0),
-            anchored_position=(5, 35)
-        )
-        coin_group.append(update_text)
-        
-        self.main_group.append(coin_group)
-        display.refresh()
+        screen.change_text.color = 0x00FF00 if change_24h >= 0 else 0xFF0000
+        screen.change_text.text = f"{arrow}{abs(change_24h):.2f}%"
+
+        screen.counter_text.text = f"{self.current_coin_index + 1}/{len(self.selected_coins)}"
+        if self.last_update:
+            screen.update_text.text = f"Last Update: {int(time.monotonic() - self.last_update)}s"
+        else:
+            screen.update_text.text = "Last Update: cached"
+
+        # Each screen has its own sparkline, only samples it hasn't drawn yet are drawn
+        screen.sparkline.update()
+        self.coin_screen = screen
+
+        self.show_group(screen.group)
+        self.latency.stop("layout", started)
+        self.frames.invalidate()
         
     def next_coin(self):
         self.current_coin_index = (self.current_coin_index + 1) % len(self.selected_coins)
-        self.create_coin_display()
-        
-    def previous_coin(self):
-        self.current_coin_index = (self.current_coin_index - 1) % len(self.selected_coins)
-        self.create_coin_display()
-        
-    def should_update_prices(self):
-        return (time.monotonic() - self.last_update) > self.update_interval
-    
-    def should_change_coin(self):
-        return (time.monotonic() - self.last_coin_change) > self.coin_change_interval
-    
-    def auto_change_coin(self):
-        self.next_coin()
-        self.last_coin_change = time.monotonic()
+        self.request_render()
         
+    def request_render(self):
+        """Asks the render task to redraw the current screen"""
+        self.render_pending = True
+        self.wake.set()
+
+    def render(self):
+        if self.is_selection_mode:
+            self.show_selection_screen()
+        else:
+            self.create_coin_display()
+
+    def update_status_label(self):
+        """Redraws only the "Last Update" age, if the coin screen is showing"""
+        if self.coin_screen is None or self.main_group[-1] is not self.coin_screen.group:
+            return
+        if self.last_update:
+            self.coin_screen.update_text.text = f"Last Update: {int(time.monotonic() - self.last_update)}s"
+        self.frames.invalidate()
+
+    def start_ticker_tasks(self):
+        self.scheduler.every("rotate", self.coin_change_interval, self.next_coin)
+        self.scheduler.every("status", self.status_interval, self.update_status_label)
+
+    def confirm_selection(self):
+        if self.selection.count > 0:
+            self.selected_coins = self.selection.selected_coins()
+            self.save_selected_coins()
+            self.is_selection_mode = False
+            self.current_coin_index = 0
+            # The pages aren't needed while ticking, free them for the coin screens
+            self.catalogue.clear()
+            self.network_wanted.set()
+            self.request_render()
+            self.start_ticker_tasks()
+
+    def rotate_display(self):
+        print("Rotating display")
+        self.toggle_display_rotation()
+
     def toggle_display_rotation(self):
         self.is_display_rotated = not self.is_display_rotated
         display.rotation = 180 if self.is_display_rotated else 0
-        display.refresh()
+        self.frames.invalidate()
         
     def run(self):
-        self.update_status_text("Loading coins...")
-        if not self.fetch_top_coins():
+        if not self.warm_boot:
+            self.update_status_text("Loading coins...")
+        # A saved selection only needs its own coins, not the catalogue
+        if self.selection.count:
+            loaded = self.fetch_selected_coins()
+        else:
+            # A cached catalogue is shown at once, even if stale
+            loaded = self.load_cached_pages() or self.fetch_page(1)
+        # With a snapshot the cached coins are still usable
+        if not loaded and not self.warm_boot:
             self.update_status_text("Error loading coins")
             return
+        self.mark_boot("coins")
 
         if not self.selected_coins:
             self.is_selection_mode = True
             self.show_selection_screen()
+            self.want_pages()
         else:
             self.is_selection_mode = False
+            # With a snapshot its prices stay on screen until new ones come in
             if self.fetch_prices():
                 self.create_coin_display()
-            else:
+            elif not self.warm_boot:
                 self.update_status_text("Error loading prices")
+        self.mark_boot("prices")
+        self.print_boot_times()
+        if self.heap.enabled:
+            self.heap.dump()
 
-        last_button0_state = True
-        last_button1_state = True
-        selection_hold_start = None
-        
+        if not self.is_selection_mode:
+            self.start_ticker_tasks()
+
+        asyncio.run(self.main())
+
+    async def main(self):
+        await asyncio.gather(self.input_task(), self.render_task(), self.network_task())
+
+    async def input_task(self):
         while True:
             try:
-                current_button0_state = button0.value
-                current_button1_state = button1.value
-                current_time = time.monotonic()
-                
-                if self.is_selection_mode:
-                    if last_button0_state and not current_button0_state:
-                        self.current_coin_index = (self.current_coin_index + 1) % len(self.available_coins)
-                        self.show_selection_screen()
-                        time.sleep(0.2)
-                    
-                    if last_button1_state and not current_button1_state:
-                        selection_hold_start = current_time
-                    elif not last_button1_state and current_button1_state:
-                        if selection_hold_start and (current_time - selection_hold_start < 5):
-                            self.toggle_current_coin()
-                        selection_hold_start = None
-                    elif not current_button1_state and selection_hold_start:
-                        if current_time - selection_hold_start >= 5:
-                            if len(self.selected_coins) > 0:
-                                self.save_selected_coins()
-                                self.is_selection_mode = False
-                                self.current_coin_index = 0
-                                if self.fetch_prices():
-                                    self.create_coin_display()
-                            selection_hold_start = None
-                
-                else:
-                    if last_button0_state and not current_button0_state:
-                        self.button_press_start = current_time
-                    elif not last_button0_state and current_button0_state:
-                        if self.button_press_start is not None:
-                            if current_time - self.button_press_start < 2:
-                                print("Next coin")
-                                self.current_coin_index = (self.current_coin_index + 1) % len(self.selected_coins)
-                                self.create_coin_display()
-                            self.button_press_start = None
-                        time.sleep(0.2)
-                    elif not current_button0_state and self.button_press_start is not None:
-                        if current_time - self.button_press_start >= 2:
-                            print("Rotating display")
-                            self.toggle_display_rotation()
-                            self.button_press_start = None
-                            time.sleep(0.2)
-                    
-                    if self.should_update_prices():
-                        print("Updating prices...")
-                        if self.fetch_prices():
-                            self.create_coin_display()
-                    
-                    if self.should_change_coin():
-                        self.current_coin_index = (self.current_coin_index + 1) % len(self.selected_coins)
-                        self.create_coin_display()
-                        self.last_coin_change = current_time
-                
-                last_button0_state = current_button0_state
-                last_button1_state = current_button1_state
-                
-                time.sleep(0.1)
-                
+                while buttons.events.get_into(self.button_event):
+                    self.handle_button(self.button_event)
+                if supervisor.runtime.serial_bytes_available:
+                    self.handle_serial(sys.stdin.read(1))
             except Exception as e:
-                print(f"Error in main loop: {e}")
-                time.sleep(1)
+                print(f"Error handling input: {e}")
+            await asyncio.sleep(INPUT_POLL_INTERVAL)
+
+    async def render_task(self):
+        """Runs the scheduler's timers and every redraw, then refreshes the
+        display once for all of them"""
+        # From now on changes wait for the end of the frame
+        self.frames.immediate = False
+        while True:
+            timeout = self.scheduler.time_until_next()
+            frame = self.frames.time_until_frame()
+            if frame is not None and (timeout is None or frame < timeout):
+                timeout = frame
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                self.scheduler.run_due()
+                if self.render_pending:
+                    self.render_pending = False
+                    self.render()
+                self.frames.flush()
+            except Exception as e:
+                print(f"Error rendering: {e}")
+            # Nothing above awaits, so no wake-up from another task is lost here
+            self.wake.clear()
+
+    async def network_task(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.network_wanted.wait(), self.update_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.network_wanted.clear()
+            if self.is_selection_mode:
+                await self.fetch_wanted_pages()
+            else:
+                print("Updating prices...")
+                if await self.fetch_prices_async():
+                    self.request_render()
+
+    def handle_serial(self, command):
+        """One-letter commands typed on the serial console"""
+        if command == "m":
+            if self.heap.enabled:
+                self.heap.dump()
+            else:
+                print("Heap stats are off, see HEAP_STATS")
+        elif command == "t":
+            self.latency.dump()
+
+    def handle_button(self, event):
+        # A release while "long_press" is still pending is a short press
+        if self.is_selection_mode:
+            if event.key_number == 0 and event.pressed:
+                self.current_coin_index = (self.current_coin_index + 1) % len(self.catalogue)
+                self.want_pages()
+                self.request_render()
+            elif event.key_number == 1 and event.pressed:
+                self.scheduler.after("long_press", 5, self.confirm_selection)
+                self.wake.set()
+            elif event.key_number == 1 and self.scheduler.cancel("long_press"):
+                self.toggle_current_coin()
+        elif event.key_number == 0:
+            if event.pressed:
+                self.scheduler.after("long_press", 2, self.rotate_display)
+                self.wake.set()
+            elif self.scheduler.cancel("long_press"):
+                print("Next coin")
+                self.next_coin()
 
 # Main execution
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+"""Per-coin screens that are built once and then only patched"""
+
+import gc
+
+import displayio
+import terminalio
+from adafruit_display_text import label
+
+from price_text import PriceText
+from sparkline import Sparkline
+
+# CPython has no gc.mem_free, the cache then never evicts for memory
+mem_free = getattr(gc, "mem_free", None)
+
+
+class CoinScreen:
+    """One coin's screen. The name bar never changes; price, change, counter
+    and "Last Update" are patched in place by the ticker. Price and change are
+    PriceTexts over the shared DigitSheet digits, the sparkline charts the coin's
+    samples in history."""
+
+    def __init__(self, coin, width, height, name_bar, digits, history):
+        self.coin_id = coin["id"]
+        self.group = displayio.Group()
+
+        # Barra superior com nome da moeda
+        name_palette = displayio.Palette(1)
+        name_palette[0] = coin["color"]
+        self.group.append(displayio.TileGrid(name_bar, pixel_shader=name_palette))
+
+        self.group.append(label.Label(
+            terminalio.FONT,
+            text=f"{coin['name']} ({coin['symbol']})",
+            scale=2,
+            color=0x000000,
+            anchor_point=(0.5, 0.5),
+            anchored_position=(width//2, 15)
+        ))
+
+        self.usd_text = PriceText(
+            digits,
+            columns=width // (digits.tile_width * 5),
+            scale=5,
+            color=0x00FF00,
+            x=width//2,
+            y=height//2
+        )
+        self.group.append(self.usd_text.group)
+
+        self.change_text = PriceText(
+            digits,
+            columns=8,
+            scale=3,
+            color=0x00FF00,
+            x=width//2,
+            y=height - 20,
+            anchor_y=1.0
+        )
+        self.group.append(self.change_text.group)
+
+        self.counter_text = label.Label(
+            terminalio.FONT,
+            text="",
+            scale=1,
+            color=0x888888,
+            anchor_point=(1.0, 0.0),
+            anchored_position=(width - 5, 35)
+        )
+        self.group.append(self.counter_text)
+
+        self.update_text = label.Label(
+            terminalio.FONT,
+            text="",
+            scale=1,
+            color=0x888888,
+            anchor_point=(0.0, 0.0),
+            anchored_position=(5, 35)
+        )
+        self.group.append(self.update_text)
+
+        self.sparkline = Sparkline(
+            history,
+            self.coin_id,
+            height=16,
+            x=(width - history.capacity)//2,
+            y=height - 17
+        )
+        self.group.append(self.sparkline.tile_grid)
+
+
+class ScreenCache:
+    """CoinScreens keyed by coin id. While free heap stays above min_free every
+    screen is kept; below it the least recently shown ones are dropped before a
+    new one is built."""
+
+    def __init__(self, build, min_free=32 * 1024):
+        self._build = build
+        self.min_free = min_free
+        self._screens = {}
+        self._order = []  # Coin ids, least recently shown first
+
+    def __len__(self):
+        return len(self._screens)
+
+    def get(self, coin):
+        """The screen for coin, built if it isn't cached, now the most recently shown"""
+        coin_id = coin["id"]
+        screen = self._screens.get(coin_id)
+        if screen is None:
+            self._make_room()
+            screen = self._build(coin)
+            self._screens[coin_id] = screen
+        else:
+            self._order.remove(coin_id)
+        self._order.append(coin_id)
+        return screen
+
+    def keep(self, coin_ids):
+        """Drops the screens of coins that are no longer selected"""
+        for coin_id in list(self._screens):
+            if coin_id not in coin_ids:
+                del self._screens[coin_id]
+                self._order.remove(coin_id)
+
+    def _make_room(self):
+        if mem_free is None or mem_free() >= self.min_free:
+            return
+        gc.collect()
+        while self._order and mem_free() < self.min_free:
+            del self._screens[self._order.pop(0)]
+            gc.collect()
@@ -0,0 +1,113 @@
+"""Per-phase heap high-water marks, to tell which part of the ticker runs out of memory"""
+
+import gc
+from array import array
+
+# Columns of the table, one row per phase
+COUNT = 0  # Times the phase ran
+FREE_BEFORE = 1  # gc.mem_free() when it last started
+FREE_AFTER = 2  # ... and when it last ended
+LOW_LAST = 3  # Lowest gc.mem_free() seen during its last run
+LOW_MIN = 4  # Lowest ever
+GROWTH_LAST = 5  # gc.mem_alloc() after minus before, last run
+GROWTH_MIN = 6
+GROWTH_MAX = 7
+_COLUMNS = 8
+
+_MAX_DEPTH = 8
+
+
+class HeapStats:
+    """Heap use of named phases, in a table allocated once.
+
+    Wrap a phase in ``begin(phase)`` / ``end(phase)`` with phase an index into
+    ``names``; phases may nest. ``sample()`` in between catches a low point
+    that is freed again before the phase ends, every begin and end is a sample
+    for the phases around it too. While ``enabled`` is False, as it stays on
+    CPython which has no gc.mem_free, each call returns at once.
+    """
+
+    def __init__(self, names, enabled=True):
+        self.names = names
+        self.enabled = enabled and hasattr(gc, "mem_free")
+        self._table = array("l", [0] * (len(names) * _COLUMNS))
+        self._alloc_before = array("l", [0] * len(names))
+        self._stack = bytearray(_MAX_DEPTH)  # Phases running, outermost first
+        self._depth = 0
+
+    def sample(self):
+        """Lowers the low-water mark of every running phase to the current free heap"""
+        if not self.enabled:
+            return
+        free = gc.mem_free()
+        table = self._table
+        for i in range(self._depth):
+            row = self._stack[i] * _COLUMNS
+            if free < table[row + LOW_LAST]:
+                table[row + LOW_LAST] = free
+
+    def begin(self, phase):
+        if not self.enabled:
+            return
+        self.sample()
+        # Still running: an exception skipped its end, start it over
+        for i in range(self._depth):
+            if self._stack[i] == phase:
+                self._depth = i
+                break
+        if self._depth == _MAX_DEPTH:
+            return
+        self._stack[self._depth] = phase
+        self._depth += 1
+        free = gc.mem_free()
+        row = phase * _COLUMNS
+        self._table[row + FREE_BEFORE] = free
+        self._table[row + LOW_LAST] = free
+        self._alloc_before[phase] = gc.mem_alloc()
+
+    def end(self, phase):
+        if not self.enabled:
+            return
+        self.sample()
+        for i in range(self._depth - 1, -1, -1):
+            if self._stack[i] == phase:
+                # Phases begun inside it and never ended go with it
+                self._depth = i
+                break
+        else:
+            return
+        table = self._table
+        row = phase * _COLUMNS
+        growth = gc.mem_alloc() - self._alloc_before[phase]
+        first = table[row + COUNT] == 0
+        table[row + COUNT] += 1
+        table[row + FREE_AFTER] = gc.mem_free()
+        if first or table[row + LOW_LAST] < table[row + LOW_MIN]:
+            table[row + LOW_MIN] = table[row + LOW_LAST]
+        table[row + GROWTH_LAST] = growth
+        if first or growth < table[row + GROWTH_MIN]:
+            table[row + GROWTH_MIN] = growth
+        if first or growth > table[row + GROWTH_MAX]:
+            table[row + GROWTH_MAX] = growth
+
+    def get(self, phase, column):
+        return self._table[phase * _COLUMNS + column]
+
+    def reset(self):
+        for i in range(len(self._table)):
+            self._table[i] = 0
+        self._depth = 0
+
+    def dump(self):
+        """Prints the table to the serial console, in bytes"""
+        print(f"Heap: {gc.mem_free()} free, {gc.mem_alloc()} allocated")
+        print(f"  {'phase':<14}{'runs':>5}{'before':>8}{'after':>8}{'low':>8}{'low min':>8}"
+              f"{'grew':>8}{'min':>8}{'max':>8}")
+        for phase, name in enumerate(self.names):
+            row = phase * _COLUMNS
+            if not self._table[row + COUNT]:
+                continue
+            print(f"  {name:<14}" + "".join(f"{self._table[row + column]:>{5 if column == COUNT else 8}}"
+                                            for column in range(_COLUMNS)))
+        if self._depth:
+            print("  running: " + " > ".join(self.names[self._stack[i]] for i in range(self._depth)))
@@ -0,0 +1,239 @@
+"""Streaming reader that pulls selected fields out of a JSON array of objects.
+
+The whole document is never held in memory: bytes are read through ``readinto``
+into one small buffer, unwanted values (including nested objects and arrays) are
+skipped as they stream past, and each object is reduced to a tuple holding only
+the requested keys, in the order they were asked for.
+"""
+
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_COLON = ord(":")
+_COMMA = ord(",")
+_OPEN_OBJECT = ord("{")
+_CLOSE_OBJECT = ord("}")
+_OPEN_ARRAY = ord("[")
+_CLOSE_ARRAY = ord("]")
+_WHITESPACE = b" \t\r\n"
+_DELIMITERS = b" \t\r\n,}]"
+_ESCAPES = {
+    ord("b"): 0x08,
+    ord("f"): 0x0C,
+    ord("n"): 0x0A,
+    ord("r"): 0x0D,
+    ord("t"): 0x09,
+}
+_LITERALS = {ord("t"): (b"rue", True), ord("f"): (b"alse", False), ord("n"): (b"ull", None)}
+
+
+class FieldReader:
+    """Iterates over the objects of a JSON array read from ``stream``, yielding a tuple
+    with the values of ``keys`` for each of them (``None`` when a key is missing or
+    holds an object/array).
+
+    ``stream`` only needs a ``readinto`` method, like ``Response.raw``.
+
+    With ``resumable``, the bytes of the object being read stay in the buffer (which
+    grows to the largest object) so that when ``readinto`` raises, for example a
+    non-blocking stream with nothing received yet, the next call to ``next()``
+    parses that object again from its start.
+    """
+
+    def __init__(self, stream, keys, buffer_size=256, resumable=False):
+        self._stream = stream
+        self._resumable = resumable
+        self._index = {}
+        for i, key in enumerate(keys):
+            self._index[bytes(key, "utf-8")] = i
+        self._width = len(keys)
+        self._buffer = bytearray(buffer_size)
+        self._pos = 0
+        self._end = 0
+        self._mark = 0  # Start of the object being read, with resumable
+        self._started = False  # The array was opened
+        self._done = False
+        # Holds the key or value being decoded, grows only for long strings
+        self._token = bytearray(32)
+        self._token_length = 0
+
+    def _fill(self):
+        # Only the object a resume would read again is kept
+        keep = self._mark if self._resumable else self._pos
+        length = self._end - keep
+        buf = self._buffer
+        if keep:
+            buf[:length] = memoryview(buf)[keep : self._end]
+            self._pos -= keep
+            self._mark -= min(keep, self._mark)
+            self._end = length
+        if length == len(buf):
+            buf = bytearray(2 * len(buf))
+            buf[:length] = self._buffer
+            self._buffer = buf
+        read = self._stream.readinto(memoryview(buf)[length:])
+        if not read:
+            raise ValueError("Unexpected end of JSON data")
+        self._end = length + read
+
+    def _next(self):
+        if self._pos >= self._end:
+            self._fill()
+        c = self._buffer[self._pos]
+        self._pos += 1
+        return c
+
+    def _next_token(self):
+        c = self._next()
+        while c in _WHITESPACE:
+            c = self._next()
+        return c
+
+    def _expect(self, c, expected, what):
+        if c != expected:
+            raise ValueError(f"Expected {what} in JSON data")
+
+    def _append(self, c):
+        if self._token_length == len(self._token):
+            token = bytearray(len(self._token) * 2)
+            token[: self._token_length] = self._token
+            self._token = token
+        self._token[self._token_length] = c
+        self._token_length += 1
+
+    def _read_string(self, keep):
+        """Reads up to the closing quote, decoding into the token buffer if keep is set"""
+        self._token_length = 0
+        high = 0  # A \u high surrogate waiting for its low half
+        while True:
+            c = self._next()
+            if c == _QUOTE:
+                if high:
+                    self._append_code(high)
+                return
+            if c == _BACKSLASH:
+                c = self._next()
+                if not keep:
+                    continue
+                if c == ord("u"):
+                    code = 0
+                    for _ in range(4):
+                        code = code * 16 + int(chr(self._next()), 16)
+                    if high and 0xDC00 <= code <= 0xDFFF:
+                        # Characters beyond the BMP come as a pair of escapes
+                        code = 0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)
+                    elif high:
+                        self._append_code(high)
+                    high = 0
+                    if 0xD800 <= code <= 0xDBFF:
+                        high = code
+                    else:
+                        self._append_code(code)
+                    continue
+                c = _ESCAPES.get(c, c)
+            if keep:
+                if high:
+                    self._append_code(high)
+                    high = 0
+                self._append(c)
+
+    def _append_code(self, code):
+        """Appends code point code as utf-8, U+FFFD if it is a lone surrogate"""
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xFFFD
+        for b in chr(code).encode("utf-8"):
+            self._append(b)
+
+    def _read_number(self, c, keep):
+        self._token_length = 0
+        while c not in _DELIMITERS:
+            if keep:
+                self._append(c)
+            c = self._next()
+        # The delimiter belongs to the enclosing object, hand it back
+        self._pos -= 1
+        if not keep:
+            return None
+        number = str(memoryview(self._token)[: self._token_length], "ascii")
+        for marker in ".eE":
+            if marker in number:
+                return float(number)
+        return int(number)
+
+    def _read_literal(self, c):
+        if c not in _LITERALS:
+            raise ValueError(f"Unexpected character {chr(c)!r} in JSON data")
+        rest, value = _LITERALS[c]
+        for expected in rest:
+            if self._next() != expected:
+                raise ValueError("Invalid literal in JSON data")
+        return value
+
+    def _skip_container(self):
+        depth = 1
+        while depth:
+            c = self._next()
+            if c == _QUOTE:
+                self._read_string(False)
+            elif c in (_OPEN_OBJECT, _OPEN_ARRAY):
+                depth += 1
+            elif c in (_CLOSE_OBJECT, _CLOSE_ARRAY):
+                depth -= 1
+
+    def _read_value(self, c, keep):
+        if c == _QUOTE:
+            self._read_string(keep)
+            if keep:
+                return str(memoryview(self._token)[: self._token_length], "utf-8")
+            return None
+        if c in (_OPEN_OBJECT, _OPEN_ARRAY):
+            self._skip_container()
+            return None
+        if c == ord("-") or ord("0") <= c <= ord("9"):
+            return self._read_number(c, keep)
+        return self._read_literal(c)
+
+    def _read_object(self):
+        record = [None] * self._width
+        c = self._next_token()
+        if c == _CLOSE_OBJECT:
+            return tuple(record)
+        while True:
+            self._expect(c, _QUOTE, "a key")
+            self._read_string(True)
+            index = self._index.get(bytes(memoryview(self._token)[: self._token_length]))
+            self._expect(self._next_token(), _COLON, "':'")
+            value = self._read_value(self._next_token(), index is not None)
+            if index is not None:
+                record[index] = value
+            c = self._next_token()
+            if c == _CLOSE_OBJECT:
+                return tuple(record)
+            self._expect(c, _COMMA, "',' or '}'")
+            c = self._next_token()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        # Back to the start of the object, if readinto raised during the last call
+        self._pos = self._mark
+        if not self._started:
+            self._expect(self._next_token(), _OPEN_ARRAY, "an array")
+            if self._next_token() == _CLOSE_ARRAY:
+                self._done = True
+                raise StopIteration
+            self._pos -= 1
+            self._mark = self._pos
+            self._started = True
+        self._expect(self._next_token(), _OPEN_OBJECT, "an object")
+        record = self._read_object()
+        c = self._next_token()
+        if c == _CLOSE_ARRAY:
+            self._done = True
+        else:
+            self._expect(c, _COMMA, "',' or ']'")
+        self._mark = self._pos
+        return record
+
@@ -0,0 +1,104 @@
+"""Latency histograms of the ticker's hot paths, in fixed memory"""
+
+import time
+from array import array
+
+# supervisor.ticks_ms() wraps around at 2**29, staying a small int
+_TICKS_MASK = (1 << 29) - 1
+
+try:
+    from supervisor import ticks_ms
+except ImportError:
+    # CPython
+    def ticks_ms():
+        return (time.monotonic_ns() // 1_000_000) & _TICKS_MASK
+
+# Bucket i < 4 holds i ms. Above, each doubling of the latency is split in 4
+# buckets, so a bucket is at most 25% wide; the last one, from ~115 s, takes
+# everything longer.
+BUCKETS = 64
+
+
+def bucket_of(ms):
+    if ms < 4:
+        return ms
+    shift = 0
+    while ms >= 8:
+        ms >>= 1
+        shift += 1
+    return min(BUCKETS - 1, shift * 4 + ms)
+
+
+def bucket_limit(bucket):
+    """Highest latency in ms counted in bucket"""
+    if bucket < 4:
+        return bucket
+    shift, sub = divmod(bucket - 4, 4)
+    return ((5 + sub) << shift) - 1
+
+
+class LatencyStats:
+    """Millisecond histograms for named stages, allocated once.
+
+    ``started = stats.start()`` then ``stats.stop(stage, started)`` counts the time in
+    between for stage, one of ``names``. Recording allocates nothing, so the
+    histograms can run for weeks; `percentile` reads them back to the bucket.
+    adafruit_requests.Session takes one as ``timings``.
+    """
+
+    def __init__(self, names, clock=ticks_ms):
+        self.names = names
+        self.clock = clock
+        self._index = {name: i for i, name in enumerate(names)}
+        self._buckets = array("L", [0] * (len(names) * BUCKETS))
+        self._counts = array("L", [0] * len(names))
+        self._max = array("L", [0] * len(names))
+
+    def start(self):
+        return self.clock()
+
+    def stop(self, stage, started):
+        """Records the ms since started for stage, returns them"""
+        ms = (self.clock() - started) & _TICKS_MASK
+        self.record(stage, ms)
+        return ms
+
+    def record(self, stage, ms):
+        i = self._index[stage]
+        self._buckets[i * BUCKETS + bucket_of(ms)] += 1
+        self._counts[i] += 1
+        if ms > self._max[i]:
+            self._max[i] = ms
+
+    def count(self, stage):
+        return self._counts[self._index[stage]]
+
+    def percentile(self, stage, percent):
+        """Upper bound in ms of the bucket holding the percentile, None without samples"""
+        i = self._index[stage]
+        count = self._counts[i]
+        if not count:
+            return None
+        wanted = (count * percent + 99) // 100  # Samples at or below it, rounded up
+        seen = 0
+        for bucket in range(BUCKETS):
+            seen += self._buckets[i * BUCKETS + bucket]
+            if seen >= wanted:
+                return min(bucket_limit(bucket), self._max[i])
+        return self._max[i]
+
+    def reset(self):
+        for i in range(len(self._buckets)):
+            self._buckets[i] = 0
+        for i in range(len(self.names)):
+            self._counts[i] = 0
+            self._max[i] = 0
+
+    def dump(self):
+        """Prints count, p50, p95, p99 and max per stage to the serial console"""
+        print(f"Latency (ms): {'count':>7}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}")
+        for i, name in enumerate(self.names):
+            if not self._counts[i]:
+                continue
+            print(f"  {name:<12}{self._counts[i]:>7}{self.percentile(name, 50):>7}"
+                  f"{self.percentile(name, 95):>7}{self.percentile(name, 99):>7}{self._max[i]:>7}")
@@ -43,11 +43,26 @@ import errno
 import json as json_module
 import os
 import sys
+import time
 
 from adafruit_connection_manager import get_connection_manager
 
+# Content-Encoding support, see _Decompressor. Builds that can't stream the decoding
+# don't ask for compressed bodies.
+try:
+    import zlib
+except ImportError:
+    zlib = None
+try:
+    import deflate
+except ImportError:
+    deflate = None
+
 SEEK_END = 2
 
+# Errors a non-blocking socket raises when it can't send or receive right now
+_WOULD_BLOCK = (errno.EAGAIN, errno.ETIMEDOUT)
+
 if not sys.implementation.name == "circuitpython":
     from types import TracebackType
     from typing import IO, Any, Dict, Optional, Type
@@ -70,7 +85,11 @@ class _RawResponse:
         """
         if size == -1:
             return self._response.content
-        return self._response.socket.recv(size)
+        # Through _readinto, which serves the bytes received with the headers first
+        # and doesn't mistake chunk sizes for body
+        buf = bytearray(size)
+        read = self._response._readinto(buf)
+        return bytes(memoryview(buf)[:read])
 
     def readinto(self, buf: bytearray) -> int:
         """Read as much as available into buf or until it is full. Returns the number of bytes read
@@ -78,6 +97,146 @@ class _RawResponse:
         return self._response._readinto(buf)
 
 
+class _EncodedBody:
+    """The body as the server encoded it, for deflate.DeflateIO to read from"""
+
+    def __init__(self, response: "Response") -> None:
+        self._response = response
+
+    def readinto(self, buf: bytearray) -> int:
+        """Read the still encoded body into buf"""
+        return self._response._read_encoded(buf)
+
+
+_DECODED_CHUNK = 1024
+
+
+class _Decompressor:
+    """Decodes a gzip or deflate body for `Response._readinto`, with the first of:
+
+    * ``zlib.decompressobj`` (CPython): streams, 256 compressed bytes at a time;
+    * ``deflate.DeflateIO`` (MicroPython's deflate module): streams too;
+    * ``zlib.decompress`` (CircuitPython's zlib): the compressed body is received
+      whole, then decoded in one go. The whole decoded body is then held too, so a
+      session only asks for compressed bodies if it can `stream` them; a caller can
+      still send its own Accept-Encoding for small bodies.
+    """
+
+    def __init__(self, response: "Response", encoding: str) -> None:
+        self._response = response
+        # 16 + window bits: gzip header and trailer, without: zlib's
+        wbits = 31 if encoding == "gzip" else 15
+        self._wbits = wbits
+        self._output = b""
+        self._output_start = 0
+        self._done = False
+        self._stream = None
+        self._io = None
+        self._input = None  # Compressed bytes, as received
+        if zlib is not None and hasattr(zlib, "decompressobj"):
+            self._stream = zlib.decompressobj(wbits)
+            self._input = bytearray(256)
+        elif deflate is not None:
+            form = deflate.GZIP if encoding == "gzip" else deflate.ZLIB
+            self._io = deflate.DeflateIO(_EncodedBody(response), form)
+
+    @staticmethod
+    def available() -> bool:
+        """Whether this build can decode compressed bodies at all"""
+        return (zlib is not None and hasattr(zlib, "decompress")) or deflate is not None
+
+    @staticmethod
+    def streams() -> bool:
+        """Whether this build decodes compressed bodies as they are read"""
+        return (zlib is not None and hasattr(zlib, "decompressobj")) or deflate is not None
+
+    def _refill(self) -> None:
+        """Decode more of the body into _output, sets _done at its end"""
+        if self._stream is not None:
+            # At most _DECODED_CHUNK bytes at a time, a few compressed bytes can make many
+            if self._stream.unconsumed_tail:
+                self._output = self._stream.decompress(self._stream.unconsumed_tail, _DECODED_CHUNK)
+                self._output_start = 0
+                return
+            read = self._response._read_encoded(self._input)
+            if read:
+                self._output = self._stream.decompress(memoryview(self._input)[:read], _DECODED_CHUNK)
+            else:
+                self._output = self._stream.flush()
+                self._done = True
+        else:
+            # Resumable like Response._read_body, if a non-blocking socket raises
+            if self._input is None:
+                self._input = bytearray(256)
+                self._input_length = 0
+            while True:
+                if self._input_length == len(self._input):
+                    grown = bytearray(2 * len(self._input))
+                    grown[: self._input_length] = self._input
+                    self._input = grown
+                read = self._response._read_encoded(memoryview(self._input)[self._input_length :])
+                if not read:
+                    break
+                self._input_length += read
+            compressed = memoryview(self._input)[: self._input_length]
+            self._output = zlib.decompress(compressed, self._wbits)
+            self._input = None
+            self._done = True
+        self._output_start = 0
+
+    def readinto(self, buf: bytearray) -> int:
+        """Copy decoded bytes into buf, returns 0 at the end of the body"""
+        if self._io is not None:
+            return self._io.readinto(buf)
+        while self._output_start == len(self._output):
+            if self._done:
+                return 0
+            self._refill()
+        read = len(self._output) - self._output_start
+        if read > len(buf):
+            read = len(buf)
+        buf[:read] = memoryview(self._output)[self._output_start : self._output_start + read]
+        self._output_start += read
+        return read
+
+
+class _BufferedBody:
+    """The body as a stream for ``json.load``. The socket is read ``size`` bytes at a
+    time, however little the decoder asks for per call (CircuitPython's asks for 64)."""
+
+    def __init__(self, response: "Response", size: int) -> None:
+        self._response = response
+        self._buffer = bytearray(size)
+        self._start = 0
+        self._end = 0
+
+    def readinto(self, buf: bytearray) -> int:
+        """Copy up to len(buf) buffered bytes into buf, refilling the buffer if it is empty.
+        Returns 0 at the end of the body."""
+        if self._start == self._end:
+            if len(buf) >= len(self._buffer):
+                # Nothing to gain from copying through the buffer
+                return self._response._readinto(buf)
+            self._start = 0
+            self._end = self._response._readinto(self._buffer)
+        read = self._end - self._start
+        if read > len(buf):
+            read = len(buf)
+        buf[:read] = memoryview(self._buffer)[self._start : self._start + read]
+        self._start += read
+        return read
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes, or the rest of the body"""
+        if size == -1:
+            rest = memoryview(self._buffer)[self._start : self._end]
+            self._start = self._end
+            return bytes(rest) + self._response.content
+        buf = bytearray(size)
+        read = self.readinto(buf)
+        return bytes(memoryview(buf)[:read])
+
+
 class OutOfRetries(Exception):
     """Raised when requests has retried to make a request unsuccessfully."""
 
@@ -102,31 +261,40 @@ class Response:
     It is still necessary to ``close`` the response object for correct management of
     sockets, including doing so implicitly via ``with requests.get(...) as response``."""
 
-    def __init__(self, sock: SocketType, session: "Session", method: str) -> None:
+    def __init__(
+        self, sock: SocketType, session: "Session", method: str, defer_parsing: bool = False
+    ) -> None:
         self.socket = sock
         self.encoding = "utf-8"
         self._cached = None
         self._headers = {}
         self._method = method
 
-        # _start_index and _receive_buffer are used when parsing headers.
-        # _receive_buffer will grow by 32 bytes everytime it is too small.
-        self._received_length = 0
-        self._receive_buffer = bytearray(32)
+        # Bytes received but not consumed yet are _receive_buffer[_buffer_start:_buffer_end].
+        # Consuming only moves _buffer_start; the buffer doubles when a line doesn't fit.
+        self._receive_buffer = bytearray(64)
+        self._buffer_start = 0
+        self._buffer_end = 0
+        self._span_start = 0
         self._remaining = None
         self._chunked = False
+        self._in_trailers = False
+        self._raw = None
+        self._body = None  # Filled by _read_body
+        self._body_length = 0
+        self._decoder = None  # _Decompressor of a gzip/deflate body, if the session asked
+        self._session = session
+        self._validator_entry = None  # (url, etag, last_modified) to cache with the decoded body
 
-        http = self._readto(b" ")
-        if not http:
+        # PendingRequest parses a non-blocking socket as data arrives instead
+        if defer_parsing:
+            return
+
+        if not self._parse_status_line():
             session._connection_manager.close_socket(self.socket)
             raise RuntimeError("Unable to read HTTP response.")
-        self.status_code: int = int(bytes(self._readto(b" ")))
-        """The status code returned by the server"""
-        self.reason: bytearray = self._readto(b"\r\n")
-        """The status reason returned by the server"""
         self._parse_headers()
-        self._raw = None
-        self._session = session
+        self._start_decoder()
 
     def __enter__(self) -> "Response":
         return self
@@ -142,71 +310,94 @@ class Response:
     def _recv_into(self, buf: bytearray, size: int = 0) -> int:
         return self.socket.recv_into(buf, size)
 
-    def _readto(self, stop: bytes) -> bytearray:
+    def _make_room(self) -> None:
+        """Free space after _buffer_end: move the unconsumed bytes to the front, or
+        double the buffer if they fill it."""
         buf = self._receive_buffer
-        end = self._received_length
+        start = self._buffer_start
+        length = self._buffer_end - start
+        if start:
+            buf[:length] = memoryview(buf)[start : self._buffer_end]
+        if length == len(buf):
+            new_buf = bytearray(2 * len(buf))
+            new_buf[:length] = buf
+            self._receive_buffer = new_buf
+        self._buffer_start = 0
+        self._buffer_end = length
+
+    def _readto_span(self, stop: bytes) -> int:
+        """Receive until stop and consume it. Returns the end of the bytes before it in
+        _receive_buffer and leaves their start in _span_start (a tuple would be allocated),
+        both valid until the next read."""
+        start = self._buffer_start
+        searched = start  # Where stop can't begin
         while True:
-            i = buf.find(stop, 0, end)
+            buf = self._receive_buffer
+            end = self._buffer_end
+            i = buf.find(stop, searched, end)
             if i >= 0:
-                # Stop was found. Return everything up to but not including stop.
-                result = buf[:i]
-                new_start = i + len(stop)
-                # Remove everything up to and including stop from the buffer.
-                new_end = end - new_start
-                buf[:new_end] = buf[new_start:end]
-                self._received_length = new_end
-                return result
-
-            # Not found so load more bytes.
-            # If our buffer is full, then make it bigger to load more.
+                if i + len(stop) == end:
+                    # All consumed, the next read starts at the front again
+                    self._buffer_start = self._buffer_end = 0
+                else:
+                    self._buffer_start = i + len(stop)
+                self._span_start = start
+                return i
+            searched = max(start, end - len(stop) + 1)
+
             if end == len(buf):
-                new_buf = bytearray(len(buf) + 32)
-                new_buf[: len(buf)] = buf
-                buf = new_buf
-                self._receive_buffer = buf
+                self._make_room()
+                searched -= start
+                start = 0
+                buf = self._receive_buffer
+                end = self._buffer_end
 
+            # On OSError what was received is kept, a non-blocking caller will retry
             read = self._recv_into(memoryview(buf)[end:])
             if read == 0:
-                self._received_length = 0
-                return buf[:end]
-            end += read
+                self._buffer_start = self._buffer_end
+                self._span_start = start
+                return end
+            self._buffer_end = end + read
 
     def _read_from_buffer(
         self, buf: Optional[bytearray] = None, nbytes: Optional[int] = None
     ) -> int:
-        if self._received_length == 0:
+        start = self._buffer_start
+        read = self._buffer_end - start
+        if read == 0:
             return 0
-        read = self._received_length
         if nbytes < read:
             read = nbytes
-        membuf = memoryview(self._receive_buffer)
         if buf:
-            buf[:read] = membuf[:read]
-        if read < self._received_length:
-            new_end = self._received_length - read
-            self._receive_buffer[:new_end] = membuf[read : self._received_length]
-            self._received_length = new_end
+            buf[:read] = memoryview(self._receive_buffer)[start : start + read]
+        if start + read < self._buffer_end:
+            self._buffer_start = start + read
         else:
-            self._received_length = 0
+            self._buffer_start = self._buffer_end = 0
         return read
 
     def _readinto(self, buf: bytearray) -> int:
+        """Read body bytes into buf, decompressed if there is a decoder. Returns 0 at the end."""
+        if self._decoder:
+            return self._decoder.readinto(buf)
+        return self._read_encoded(buf)
+
+    def _read_encoded(self, buf: bytearray) -> int:
+        """Read body bytes as sent, after Transfer-Encoding but before Content-Encoding"""
         if not self.socket:
             raise RuntimeError("Newer Response closed this one. Use Responses immediately.")
 
+        if self._in_trailers:
+            self._read_trailers()
+            return 0
+
         if not self._remaining:
-            # Consume the chunk header if need be.
             if self._chunked:
-                # Consume trailing \r\n for chunks 2+
-                if self._remaining == 0:
-                    self._throw_away(2)
-                chunk_header = bytes(self._readto(b"\r\n")).split(b";", 1)[0]
-                http_chunk_size = int(bytes(chunk_header), 16)
-                if http_chunk_size == 0:
-                    self._chunked = False
-                    self._parse_headers()
+                self._next_chunk()
+                if self._in_trailers:
+                    self._read_trailers()
                     return 0
-                self._remaining = http_chunk_size
             elif self._remaining is None:
                 # the Content-Length is not provided in the HTTP header
                 # so try parsing as long as their is data in the socket
@@ -228,18 +419,107 @@ class Response:
 
         return read
 
-    def _throw_away(self, nbytes: int) -> None:
-        nbytes -= self._read_from_buffer(nbytes=nbytes)
-
+    def _next_chunk(self) -> None:
+        """Consume the line ending the previous chunk and the size line of the next, the size
+        parsed in place in _receive_buffer. After the last chunk the trailers are next.
+        Each step consumes whole lines only, so it can resume after a would-block."""
+        if self._remaining == 0:
+            # The \r\n after the data of chunks 2+
+            self._readto_span(b"\r\n")
+            self._remaining = None
+        end = self._readto_span(b"\r\n")
+        start = self._span_start
         buf = self._receive_buffer
-        len_buf = len(buf)
-        for _ in range(nbytes // len_buf):
-            to_read = len_buf
-            while to_read > 0:
-                to_read -= self._recv_into(buf, to_read)
-        to_read = nbytes % len_buf
-        while to_read > 0:
-            to_read -= self._recv_into(buf, to_read)
+        size = 0
+        i = start
+        # Hex digits, up to the end of the line or the extensions after them
+        while i < end:
+            byte = buf[i]
+            if 0x30 <= byte <= 0x39:
+                digit = byte - 0x30
+            elif 0x61 <= byte | 0x20 <= 0x66:
+                digit = (byte | 0x20) - 0x57
+            else:
+                break
+            size = (size << 4) | digit
+            i += 1
+        if i == start:
+            raise ValueError("Invalid chunk size")
+        self._remaining = size
+        if size == 0:
+            self._chunked = False
+            self._in_trailers = True
+
+    def _read_trailers(self) -> None:
+        """Trailer fields go into headers. Without any, the blank line ending the body is
+        consumed and nothing allocated."""
+        while self._parse_header_line():
+            pass
+        self._in_trailers = False
+        self._remaining = 0
+
+    def _buffered_line(self) -> bool:
+        """Whether a whole line is in _receive_buffer, consuming it then receives nothing"""
+        return self._receive_buffer.find(b"\r\n", self._buffer_start, self._buffer_end) >= 0
+
+    def _end_of_body(self) -> bool:
+        """Consume what is left of a chunked body's framing, as a parser that stops at the
+        end of its data leaves it, but only lines already received: closing never waits on
+        the server. Returns True if the whole body has been received, the socket is then at
+        the next response."""
+        while self._chunked and not self._remaining:
+            if not self._buffered_line():
+                return False
+            if self._remaining == 0:
+                # The \r\n after the data of a chunk, the size line may not be in yet
+                self._readto_span(b"\r\n")
+                self._remaining = None
+            else:
+                self._next_chunk()
+        while self._in_trailers:
+            if not self._buffered_line():
+                return False
+            if not self._parse_header_line():
+                self._in_trailers = False
+                self._remaining = 0
+        return not self._chunked and self._remaining == 0
+
+    def _read_body(self) -> None:
+        """Receive the rest of the body into _body, one bytearray of exactly Content-Length
+        bytes if the server sent one, else grown by doubling. Can be called again after a
+        non-blocking socket raised, it continues where it stopped."""
+        if self._body is None:
+            if self._remaining is not None and not self._chunked and not self._decoder:
+                size = self._remaining
+            else:
+                size = 256
+            self._body = bytearray(size)
+            self._body_length = 0
+        while True:
+            body = self._body
+            if self._body_length == len(body):
+                if (
+                    self._remaining == 0
+                    and not self._chunked
+                    and not self._in_trailers
+                    and not self._decoder
+                ):
+                    return
+                new_body = bytearray(2 * len(body))
+                new_body[: len(body)] = body
+                body = self._body = new_body
+            read = self._readinto(memoryview(body)[self._body_length :])
+            if not read:
+                return
+            self._body_length += read
+
+    def _take_body(self) -> bytearray:
+        """The body received by _read_body, released from the response"""
+        body = self._body
+        if self._body_length < len(body):
+            body = body[: self._body_length]
+        self._body = None
+        return body
 
     def close(self) -> None:
         """Close out the socket. If we have a session free it instead."""
@@ -247,36 +527,88 @@ class Response:
             return
 
         if self._session:
-            self._session._connection_manager.free_socket(self.socket)
+            # A socket left inside a body can't take the next request
+            try:
+                reusable = self._end_of_body()
+            except (OSError, ValueError):
+                reusable = False
+            if reusable:
+                self._session._connection_manager.free_socket(self.socket)
+            else:
+                self._session._connection_manager.close_socket(self.socket)
         else:
             self.socket.close()
 
         self.socket = None
 
+    def _parse_status_line(self) -> bool:
+        """
+        Parses the rest of the status line (the "H" was read by `Session.request`).
+        Returns False if the connection closed before one was received.
+        """
+        end = self._readto_span(b"\r\n")
+        start = self._span_start
+        buf = self._receive_buffer
+        status_start = buf.find(b" ", start, end) + 1
+        if not status_start:
+            return False
+        status_end = buf.find(b" ", status_start, end)
+        if status_end < 0:
+            # The reason phrase is optional
+            status_end = end
+        self.status_code: int = int(bytes(buf[status_start:status_end]))
+        """The status code returned by the server"""
+        self.reason: bytearray = buf[status_end + 1 : end]
+        """The status reason returned by the server"""
+        return True
+
+    def _parse_header_line(self) -> bool:
+        """Parses one header line, returns False on the blank line ending the headers."""
+        end = self._readto_span(b"\r\n")
+        start = self._span_start
+        if start == end:
+            return False
+        buf = self._receive_buffer
+        colon = buf.find(b":", start, end)
+        if colon < 0:
+            raise ValueError("Invalid header line")
+        # Trim the value in place, only title and value are copied out
+        value_start = colon + 1
+        while value_start < end and buf[value_start] <= 0x20:
+            value_start += 1
+        value_end = end
+        while value_end > value_start and buf[value_end - 1] <= 0x20:
+            value_end -= 1
+        if colon > start and value_end > value_start:
+            # enforce that all headers are lowercase
+            title = str(buf[start:colon], "utf-8").lower()
+            content = str(buf[value_start:value_end], "utf-8")
+            if title == "content-length":
+                self._remaining = int(content)
+            if title == "transfer-encoding":
+                self._chunked = content.strip().lower() == "chunked"
+            if title == "set-cookie" and title in self._headers:
+                self._headers[title] += ", " + content
+            else:
+                self._headers[title] = content
+        return True
+
     def _parse_headers(self) -> None:
         """
         Parses the header portion of an HTTP request/response from the socket.
         Expects first line of HTTP request/response to have been read already.
         """
-        while True:
-            header = self._readto(b"\r\n")
-            if not header:
-                break
-            title, content = bytes(header).split(b":", 1)
-            content = content.strip()
-            if title and content:
-                # enforce that all headers are lowercase
-                title = str(title, "utf-8").lower()
-                content = str(content, "utf-8")
-                if title == "content-length":
-                    self._remaining = int(content)
-                if title == "transfer-encoding":
-                    self._chunked = content.strip().lower() == "chunked"
-                if title == "set-cookie" and title in self._headers:
-                    self._headers[title] += ", " + content
-                else:
-                    self._headers[title] = content
+        while self._parse_header_line():
+            pass
+        self._check_fixed_length()
+
+    def _start_decoder(self) -> None:
+        """Decode a gzip or deflate body if the session asked for one"""
+        encoding = self._headers.get("content-encoding")
+        if encoding in ("gzip", "deflate") and self._remaining != 0 and self._session._decompress:
+            self._decoder = _Decompressor(self, encoding)
 
+    def _check_fixed_length(self) -> None:
         # does the body have a fixed length? (of zero)
         if (
             self.status_code == 204
@@ -285,9 +617,18 @@ class Response:
             or self._method == "HEAD"
         ):
             self._remaining = 0
+            self._chunked = False
+
+    def _store_validated(self, body: Any) -> None:
+        """Keep the decoded body in the session's validator cache, if it asked for it."""
+        if self._validator_entry is not None:
+            self._session._cache_validated(self._validator_entry, body)
 
     def _validate_not_gzip(self) -> None:
-        """gzip encoding is not supported. Raise an exception if found."""
+        """gzip encoding is only supported by sessions with ``decompress``. Raise an exception
+        if found otherwise."""
+        if self._decoder:
+            return
         if "content-encoding" in self.headers and self.headers["content-encoding"] == "gzip":
             raise ValueError(
                 "Content-encoding is gzip, data cannot be accessed as json or text. "
@@ -302,15 +643,29 @@ class Response:
         """
         return self._headers
 
+    def _receive_content(self) -> bytearray:
+        """The whole body, received straight into the bytearray returned, then close"""
+        timings = self._session and self._session._timings
+        started = timings.start() if timings else 0
+        self._read_body()
+        body = self._take_body()
+        self.close()
+        if timings:
+            timings.stop("body", started)
+        return body
+
     @property
-    def content(self) -> bytes:
-        """The HTTP content direct from the socket, as bytes"""
+    def content(self) -> bytearray:
+        """The HTTP content direct from the socket, a bytearray rather than bytes so the
+        body is never held twice. The validator cache keeps its own bytes copy, which is
+        what a 304 returns, so changing the bytearray doesn't change later responses."""
         if self._cached is not None:
-            if isinstance(self._cached, bytes):
+            if isinstance(self._cached, (bytes, bytearray)):
                 return self._cached
             raise RuntimeError("Cannot access content after getting text or json")
 
-        self._cached = b"".join(self.iter_content(chunk_size=32))
+        self._cached = self._receive_content()
+        self._store_validated(self._cached)
         return self._cached
 
     @property
@@ -324,24 +679,38 @@ class Response:
 
         self._validate_not_gzip()
 
-        self._cached = str(self.content, self.encoding)
+        self._cached = str(self._receive_content(), self.encoding)
+        self._store_validated(self._cached)
         return self._cached
 
+    @property
+    def raw(self) -> _RawResponse:
+        """File-like access to the body for incremental parsers, through ``readinto``.
+        Do not mix with `content`, `text`, `json` or `iter_content`."""
+        if not self._raw:
+            self._raw = _RawResponse(self)
+        return self._raw
+
     def json(self) -> Any:
         """The HTTP content, parsed into a json dictionary"""
         # The cached JSON will be a list or dictionary.
-        if self._cached:
+        if self._cached is not None:
             if isinstance(self._cached, (list, dict)):
                 return self._cached
             raise RuntimeError("Cannot access json after getting text or content")
-        if not self._raw:
-            self._raw = _RawResponse(self)
 
         self._validate_not_gzip()
 
-        obj = json_module.load(self._raw)
-        if not self._cached:
+        # Reads the body as it parses, both are counted as "json"
+        timings = self._session and self._session._timings
+        started = timings.start() if timings else 0
+        buffer_size = self._session._json_buffer_size if self._session else 0
+        obj = json_module.load(_BufferedBody(self, buffer_size) if buffer_size else self.raw)
+        if timings:
+            timings.stop("json", started)
+        if self._cached is None:
             self._cached = obj
+        self._store_validated(obj)
 
         return obj
 
@@ -364,6 +733,259 @@ class Response:
         self.close()
 
 
+class _SendBuffer:
+    """Stands in for a socket to collect a request, so it can be sent without blocking."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def send(self, data: bytes) -> int:
+        """Append data, as if it was all sent"""
+        self.data.extend(data)
+        return len(data)
+
+
+class PendingRequest:
+    """A request sent and answered without blocking, created by `Session.start_request`.
+
+    Each call to `step` sends what the socket accepts and parses what has arrived, then
+    returns. Call it (for example once per pass of an event loop) until it returns
+    ``True``; the body is then available from `content`, `text` or `json`. The socket
+    is freed for reuse once the body is complete.
+
+    GETs use the session's validator cache like `Session.request`: a ``304 Not Modified``
+    hands back the body decoded last time from the same accessor.
+
+    With ``stream``, `step` returns ``True`` once the headers are parsed and the body is
+    left on the socket for `readinto`.
+    """
+
+    def __init__(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        session: "Session",
+        host: str,
+        port: int,
+        proto: str,
+        method: str,
+        request: bytearray,
+        timeout: float,
+        validator_url: Optional[str] = None,
+        stream: bool = False,
+    ) -> None:
+        self._session = session
+        self._address = (host, port, proto)
+        self._validator_url = validator_url  # Url in the validator cache, None to skip it
+        self._stream = stream
+        self._method = method
+        self._request = request
+        self._timeout = timeout
+        self._deadline = time.monotonic() + timeout
+        self._timings = session._timings
+        self._started = 0  # Start of the current stage, for timings
+        self._retried = False
+        self._content = None
+        self.state = "send"
+        """Progress: ``"send"``, ``"status"``, ``"headers"``, ``"body"`` or ``"done"``"""
+        self.bytes_received = 0
+        """Body bytes received so far"""
+        self.content_length = None
+        """Body length announced by the server, ``None`` until known or if not announced"""
+        self.response = None
+        """The `Response` being parsed, its ``status_code`` and ``headers`` are valid
+        once `state` is ``"body"``"""
+        self._connect()
+
+    def _connect(self) -> None:
+        host, port, proto = self._address
+        timings = self._timings
+        if timings:
+            self._started = timings.start()
+        socket = self._session._connection_manager.get_socket(
+            host,
+            port,
+            proto,
+            session_id=self._session._session_id,
+            timeout=self._timeout,
+            ssl_context=self._session._ssl_context,
+        )
+        if timings:
+            timings.stop("connect", self._started)
+            self._started = timings.start()
+        socket.settimeout(0)
+        self._sent = 0
+        self.response = Response(socket, self._session, self._method, defer_parsing=True)
+
+    def _close_socket(self) -> None:
+        if self.response.socket:
+            self._session._connection_manager.close_socket(self.response.socket)
+            self.response.socket = None
+
+    def _retry(self) -> None:
+        """The socket was already closed by the server, try once more on a new one."""
+        self._close_socket()
+        if self._retried:
+            raise RuntimeError("Unable to read HTTP response.")
+        self._retried = True
+        self._connect()
+        self.state = "send"
+
+    def _step_send(self) -> None:
+        request = memoryview(self._request)
+        while self._sent < len(request):
+            sent = self.response.socket.send(request[self._sent :])
+            if not sent:
+                raise OSError(errno.EIO)
+            self._sent += sent
+        self._stage_done("send")
+        self.state = "status"
+
+    def _step_body(self) -> None:
+        response = self.response
+        try:
+            response._read_body()
+        finally:
+            self.bytes_received = response._body_length
+        self._content = response._take_body()
+        self.close()
+        self._stage_done("body")
+
+    def _stage_done(self, stage: str) -> None:
+        """Count the time since the last stage ended, including waits between steps"""
+        if self._timings:
+            self._timings.stop(stage, self._started)
+            self._started = self._timings.start()
+
+    def step(self) -> bool:
+        """Advance as far as possible without blocking, returns ``True`` once done.
+        Raises ``OSError(ETIMEDOUT)`` if the request takes longer than its timeout."""
+        try:
+            if self.state == "send":
+                self._step_send()
+            if self.state == "status":
+                if not self.response._parse_status_line():
+                    self._retry()
+                    return False
+                self._stage_done("ttfb")
+                self.state = "headers"
+            if self.state == "headers":
+                response = self.response
+                while response._parse_header_line():
+                    pass
+                response._check_fixed_length()
+                response._start_decoder()
+                if self._validator_url:
+                    self._session._update_validator_cache(self._validator_url, response)
+                if not response._chunked:
+                    self.content_length = response._remaining
+                self.state = "body"
+            if self.state == "body" and not self._stream:
+                self._step_body()
+        except OSError as exc:
+            if exc.errno not in _WOULD_BLOCK:
+                # A pooled socket the server has reset fails on the first send or read
+                if self.state in ("send", "status") and not self._retried:
+                    self._retry()
+                    return False
+                self._close_socket()
+                raise
+            if time.monotonic() > self._deadline:
+                self._close_socket()
+                raise OSError(errno.ETIMEDOUT) from exc
+        except Exception:
+            self._close_socket()
+            raise
+        return self.state == "done" or (self._stream and self.state == "body")
+
+    def readinto(self, buf: bytearray) -> int:
+        """With ``stream``, read the body as it arrives once `step` returned ``True``.
+        Returns 0 at its end, the socket is then freed. Raises ``OSError(EAGAIN)`` while
+        nothing new has arrived and ``OSError(ETIMEDOUT)`` after the timeout."""
+        if self.state == "done":
+            return 0
+        if self.state != "body":
+            raise RuntimeError("Request still in progress")
+        try:
+            read = self.response._readinto(buf)
+        except OSError as exc:
+            if exc.errno not in _WOULD_BLOCK:
+                self._close_socket()
+                raise
+            if time.monotonic() > self._deadline:
+                self._close_socket()
+                raise OSError(errno.ETIMEDOUT) from exc
+            raise OSError(errno.EAGAIN, "Nothing received yet") from exc
+        except Exception:
+            self._close_socket()
+            raise
+        self.bytes_received += read
+        if not read:
+            self.close()
+            self._stage_done("body")
+        return read
+
+    def close(self) -> None:
+        """Free the socket, also when a streamed body wasn't read to its end"""
+        if self.response.socket:
+            # Blocking again for whoever gets the socket from the connection manager next
+            self.response.socket.settimeout(self._timeout)
+            self.response.close()
+        self.state = "done"
+
+    @property
+    def status_code(self) -> int:
+        """The status code returned by the server"""
+        return self.response.status_code
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """The response headers"""
+        return self.response.headers
+
+    def _from_cache(self, kinds: tuple) -> Any:
+        """The body decoded last time if the server answered 304, else None"""
+        if self.state != "done":
+            raise RuntimeError("Request still in progress")
+        cached = self.response._cached
+        if cached is None:
+            return None
+        if not isinstance(cached, kinds):
+            raise RuntimeError("Cached body was decoded differently, use the same accessor")
+        return cached
+
+    @property
+    def content(self) -> bytearray:
+        """The body, once `step` returned ``True``. A bytearray, or after a 304 the bytes
+        kept by the validator cache."""
+        cached = self._from_cache((bytes, bytearray))
+        if cached is not None:
+            return cached
+        self.response._store_validated(self._content)
+        return self._content
+
+    @property
+    def text(self) -> str:
+        """The body decoded as utf-8"""
+        cached = self._from_cache((str,))
+        if cached is not None:
+            return cached
+        text = str(self._content, "utf-8")
+        self.response._store_validated(text)
+        return text
+
+    def json(self) -> Any:
+        """The body parsed as json"""
+        cached = self._from_cache((list, dict))
+        if cached is not None:
+            return cached
+        timings = self._timings
+        started = timings.start() if timings else 0
+        obj = json_module.loads(self._content)
+        if timings:
+            timings.stop("json", started)
+        self.response._store_validated(obj)
+        return obj
+
+
 class Session:
     """HTTP session that shares sockets and ssl context."""
 
@@ -372,11 +994,74 @@ class Session:
         socket_pool: SocketpoolModuleType,
         ssl_context: Optional[SSLContextType] = None,
         session_id: Optional[str] = None,
+        validator_cache_size: int = 0,
+        timings: Optional[Any] = None,
+        json_buffer_size: int = 512,
+        decompress: bool = False,
     ) -> None:
         self._connection_manager = get_connection_manager(socket_pool)
         self._ssl_context = ssl_context
         self._session_id = session_id
         self._last_response = None
+        # url -> [etag, last_modified, decoded body] for conditional GETs
+        self._validator_cache_size = validator_cache_size
+        self._validator_cache = {}
+        # The request line and headers are assembled in _head[:_head_length] and sent
+        # at once. Kept from one request to the next, doubled when a request doesn't fit.
+        self._head = bytearray(256)
+        self._head_length = 0
+        # Decode gzip/deflate bodies, asking for them only if the decoding streams
+        self._decompress = decompress and _Decompressor.available()
+        self._accept_encoding = self._decompress and _Decompressor.streams()
+        # Bytes received per socket read by Response.json, 0 to read what the decoder asks for
+        self._json_buffer_size = json_buffer_size
+        # Optional latency recorder: start() returns a timestamp, stop(stage, timestamp)
+        # records the time since, for stages "connect", "send", "ttfb", "body", "json"
+        self._timings = timings
+
+    def _add_validators(self, url: str, headers: Dict[str, str]) -> Dict[str, str]:
+        """Return headers with If-None-Match/If-Modified-Since for a cached url"""
+        entry = self._validator_cache.get(url)
+        # Without a decoded body to hand back, a 304 would be useless
+        if entry is None or entry[2] is None:
+            return headers
+        supplied_headers = {header.lower() for header in headers}
+        if "if-none-match" in supplied_headers or "if-modified-since" in supplied_headers:
+            return headers
+        headers = headers.copy()
+        if entry[0]:
+            headers["If-None-Match"] = entry[0]
+        if entry[1]:
+            headers["If-Modified-Since"] = entry[1]
+        return headers
+
+    def _update_validator_cache(self, url: str, resp: Response) -> None:
+        """Serve a 304 from the cache, or remember the validators of a 200"""
+        entry = self._validator_cache.get(url)
+        if resp.status_code == 304 and entry is not None and entry[2] is not None:
+            # The body is empty, hand back what was decoded last time
+            resp._cached = entry[2]
+            return
+
+        self._validator_cache.pop(url, None)
+        etag = resp.headers.get("etag")
+        last_modified = resp.headers.get("last-modified")
+        if resp.status_code != 200 or not (etag or last_modified):
+            return
+        # Cached once json, text or content decodes the body. A body read through raw
+        # never is, so it can't take the place of one that can serve a 304.
+        resp._validator_entry = (url, etag, last_modified)
+
+    def _cache_validated(self, validators: tuple, body: Any) -> None:
+        """Remember the validators of a 200 with its decoded body"""
+        url, etag, last_modified = validators
+        if isinstance(body, bytearray):
+            # content hands its bytearray to the caller, who may change it
+            body = bytes(body)
+        if url not in self._validator_cache:
+            while len(self._validator_cache) >= self._validator_cache_size:
+                del self._validator_cache[next(iter(self._validator_cache))]
+        self._validator_cache[url] = [etag, last_modified, body]
 
     def _build_boundary_data(self, files: dict):  # pylint: disable=too-many-locals
         boundary_string = self._build_boundary_string()
@@ -453,6 +1138,8 @@ class Session:
 
     @staticmethod
     def _send(socket: SocketType, data: bytes):
+        # Slices of a memoryview don't copy what is left to send
+        data = memoryview(data)
         total_sent = 0
         while total_sent < len(data):
             try:
@@ -490,18 +1177,31 @@ class Session:
             size = file_handle.readinto(b)
             if size == 0:
                 break
-            self._send(socket, b[:size])
+            self._send(socket, memoryview(b)[:size])
 
-    def _send_header(self, socket, header, value):
+    def _add_to_head(self, data: Any) -> None:
+        """Append str or bytes to the request being assembled in _head"""
+        if isinstance(data, str):
+            data = bytes(data, "utf-8")
+        start = self._head_length
+        end = start + len(data)
+        if end > len(self._head):
+            size = 2 * len(self._head)
+            while size < end:
+                size *= 2
+            head = bytearray(size)
+            head[:start] = memoryview(self._head)[:start]
+            self._head = head
+        self._head[start:end] = data
+        self._head_length = end
+
+    def _add_header(self, header: str, value: Any) -> None:
         if value is None:
             return
-        self._send_as_bytes(socket, header)
-        self._send(socket, b": ")
-        if isinstance(value, bytes):
-            self._send(socket, value)
-        else:
-            self._send_as_bytes(socket, value)
-        self._send(socket, b"\r\n")
+        self._add_to_head(header)
+        self._add_to_head(b": ")
+        self._add_to_head(value)
+        self._add_to_head(b"\r\n")
 
     # noqa: PLR0912 Too many branches
     def _send_request(  # noqa: PLR0913,PLR0912 Too many arguments in function definition,Too many branches
@@ -557,36 +1257,67 @@ class Session:
                 data = b""
             content_length = len(data)
 
-        self._send_as_bytes(socket, method)
-        self._send(socket, b" /")
-        self._send_as_bytes(socket, path)
-        self._send(socket, b" HTTP/1.1\r\n")
+        # One send for the request line, headers and a body already in memory: a send
+        # per piece would go out as that many TCP segments (and TLS records)
+        self._head_length = 0
+        self._add_to_head(method)
+        self._add_to_head(b" /")
+        self._add_to_head(path)
+        self._add_to_head(b" HTTP/1.1\r\n")
 
         # create lower-case supplied header list
         supplied_headers = {header.lower() for header in headers}
 
-        # Send headers
+        # Add headers
         if not "host" in supplied_headers:
-            self._send_header(socket, "Host", host)
+            self._add_header("Host", host)
         if not "user-agent" in supplied_headers:
-            self._send_header(socket, "User-Agent", "Adafruit CircuitPython")
+            self._add_header("User-Agent", "Adafruit CircuitPython")
+        if self._accept_encoding and not "accept-encoding" in supplied_headers:
+            self._add_header("Accept-Encoding", "gzip, deflate")
         if content_type_header and not "content-type" in supplied_headers:
-            self._send_header(socket, "Content-Type", content_type_header)
+            self._add_header("Content-Type", content_type_header)
         if (data or files) and not "content-length" in supplied_headers:
-            self._send_header(socket, "Content-Length", str(content_length))
+            self._add_header("Content-Length", str(content_length))
         # Iterate over keys to avoid tuple alloc
         for header in headers:
-            self._send_header(socket, header, headers[header])
-        self._send(socket, b"\r\n")
+            self._add_header(header, headers[header])
+        self._add_to_head(b"\r\n")
+        # A body that fits in the room left goes along, the buffer isn't grown for bodies
+        body_added = data and not data_is_file and self._head_length + len(data) <= len(self._head)
+        if body_added:
+            self._add_to_head(data)
+        self._send(socket, memoryview(self._head)[: self._head_length])
 
         # Send data
         if data_is_file:
             self._send_file(socket, data)
-        elif data:
-            self._send(socket, bytes(data))
+        elif data and not body_added:
+            self._send(socket, data)
         elif boundary_objects:
             self._send_boundary_objects(socket, boundary_objects)
 
+    @staticmethod
+    def _split_url(url: str):
+        try:
+            proto, dummy, host, path = url.split("/", 3)
+            # replace spaces in path
+            path = path.replace(" ", "%20")
+        except ValueError:
+            proto, dummy, host = url.split("/", 2)
+            path = ""
+        if proto == "http:":
+            port = 80
+        elif proto == "https:":
+            port = 443
+        else:
+            raise ValueError("Unsupported protocol: " + proto)
+
+        if ":" in host:
+            host, port = host.split(":", 1)
+            port = int(port)
+        return proto, dummy, host, port, path
+
     def request(  # noqa: PLR0912,PLR0913,PLR0915 Too many branches,Too many arguments in function definition,Too many statements
         self,
         method: str,
@@ -604,27 +1335,20 @@ class Session:
         or a json dictionary which we will stringify. 'headers' is optional HTTP headers
         sent along. 'stream' will determine if we buffer everything, or whether to only
         read only when requested
+
+        If the session was created with a ``validator_cache_size``, GET responses carrying an
+        ``ETag`` or ``Last-Modified`` header are remembered once their body is decoded, and the
+        next GET of the same url is made conditional. A ``304 Not Modified`` answer then returns
+        the previously decoded body from `Response.json`, `Response.text` or
+        `Response.content` without reading anything from the socket.
         """
         if not headers:
             headers = {}
 
-        try:
-            proto, dummy, host, path = url.split("/", 3)
-            # replace spaces in path
-            path = path.replace(" ", "%20")
-        except ValueError:
-            proto, dummy, host = url.split("/", 2)
-            path = ""
-        if proto == "http:":
-            port = 80
-        elif proto == "https:":
-            port = 443
-        else:
-            raise ValueError("Unsupported protocol: " + proto)
+        use_validators = self._validator_cache_size > 0 and method == "GET"
+        request_headers = self._add_validators(url, headers) if use_validators else headers
 
-        if ":" in host:
-            host, port = host.split(":", 1)
-            port = int(port)
+        proto, dummy, host, port, path = self._split_url(url)
 
         if self._last_response:
             self._last_response.close()
@@ -636,10 +1360,12 @@ class Session:
         # namely timeout and no data from socket. This was not covered in the stated intent of the
         # commit that introduced the loop, but removing the retry from those cases could prove
         # problematic to callers that now depend on that resiliency.
+        timings = self._timings
         retry_count = 0
         last_exc = None
         while retry_count < 2:
             retry_count += 1
+            started = timings.start() if timings else 0
             socket = self._connection_manager.get_socket(
                 host,
                 port,
@@ -648,13 +1374,21 @@ class Session:
                 timeout=timeout,
                 ssl_context=self._ssl_context,
             )
+            if timings:
+                timings.stop("connect", started)
+                started = timings.start()
             ok = True
             try:
-                self._send_request(socket, host, method, path, headers, data, json, files)
+                self._send_request(
+                    socket, host, method, path, request_headers, data, json, files
+                )
             except OSError as exc:
                 last_exc = exc
                 ok = False
             if ok:
+                if timings:
+                    timings.stop("send", started)
+                    started = timings.start()
                 # Read the H of "HTTP/1.1" to make sure the socket is alive. send can appear to work
                 # even when the socket is closed.
                 # Both recv/recv_into can raise OSError; when that happens, we need to call
@@ -668,6 +1402,8 @@ class Session:
                         socket.recv_into(result)
                     if result == b"H":
                         # Things seem to be ok so break with socket set.
+                        if timings:
+                            timings.stop("ttfb", started)
                         break
                     else:
                         raise RuntimeError("no data from socket")
@@ -681,6 +1417,8 @@ class Session:
             raise OutOfRetries("Repeated socket failures") from last_exc
 
         resp = Response(socket, self, method)  # our response
+        if use_validators:
+            self._update_validator_cache(url, resp)
         if allow_redirects:
             if "location" in resp.headers and 300 <= resp.status_code <= 399:
                 # a naive handler for redirects
@@ -708,6 +1446,42 @@ class Session:
         self._last_response = resp
         return resp
 
+    def start_request(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 60,
+        files: Optional[Dict[str, tuple]] = None,
+        stream: bool = False,
+    ) -> PendingRequest:
+        """Start a request that is then advanced with `PendingRequest.step`, so an event
+        loop can interleave it with other work. Connecting (and DNS) still blocks; sending
+        and receiving never do. Redirects are not followed. With ``stream`` the body is
+        read with `PendingRequest.readinto` instead of being received whole."""
+        if not headers:
+            headers = {}
+
+        # A streamed body is never decoded here, there would be nothing to serve a 304 from
+        use_validators = self._validator_cache_size > 0 and method == "GET" and not stream
+        validator_url = url if use_validators else None
+        if validator_url:
+            headers = self._add_validators(url, headers)
+
+        proto, _, host, port, path = self._split_url(url)
+
+        if self._last_response:
+            self._last_response.close()
+            self._last_response = None
+
+        request = _SendBuffer()
+        self._send_request(request, host, method, path, headers, data, json, files)
+        return PendingRequest(
+            self, host, port, proto, method, request.data, timeout, validator_url, stream
+        )
+
     def options(self, url: str, **kw) -> Response:
         """Send HTTP OPTIONS request"""
         return self.request("OPTIONS", url, **kw)
@@ -0,0 +1,79 @@
+"""Fixed-memory price history for the selected coins"""
+
+from array import array
+
+
+class PriceHistory:
+    """Ring buffers holding the last ``capacity`` prices of up to ``max_coins`` coins.
+
+    Every sample lives in one preallocated ``array('f')``, so the history costs
+    ``max_coins * capacity * 4`` bytes from the start and never grows.
+    """
+
+    def __init__(self, capacity, max_coins=20):
+        self.capacity = capacity
+        self.max_coins = max_coins
+        self._samples = array("f", [0.0] * (capacity * max_coins))
+        self._heads = array("H", [0] * max_coins)  # Next position to write
+        self._counts = array("H", [0] * max_coins)
+        self._totals = array("L", [0] * max_coins)  # Samples ever appended
+        self._slots = {}  # Coin id -> slot index
+
+    def track(self, coin_ids):
+        """Keeps history for coin_ids only, coins beyond max_coins are not recorded"""
+        for coin_id in list(self._slots):
+            if coin_id not in coin_ids:
+                del self._slots[coin_id]
+        used = set(self._slots.values())
+        free = [slot for slot in range(self.max_coins) if slot not in used]
+        for coin_id in coin_ids:
+            if coin_id in self._slots or not free:
+                continue
+            slot = free.pop(0)
+            self._heads[slot] = 0
+            self._counts[slot] = 0
+            self._totals[slot] = 0
+            self._slots[coin_id] = slot
+
+    def append(self, coin_id, price):
+        """Records a price, returns False if the coin isn't tracked"""
+        slot = self._slots.get(coin_id)
+        if slot is None:
+            return False
+        head = self._heads[slot]
+        self._samples[slot * self.capacity + head] = price
+        self._heads[slot] = (head + 1) % self.capacity
+        if self._counts[slot] < self.capacity:
+            self._counts[slot] += 1
+        self._totals[slot] += 1
+        return True
+
+    def count(self, coin_id):
+        """Number of samples currently held for the coin"""
+        slot = self._slots.get(coin_id)
+        return 0 if slot is None else self._counts[slot]
+
+    def total(self, coin_id):
+        """Number of samples ever appended for the coin, to detect new ones"""
+        slot = self._slots.get(coin_id)
+        return 0 if slot is None else self._totals[slot]
+
+    def get(self, coin_id, index):
+        """Sample at index, 0 being the oldest held"""
+        slot = self._slots[coin_id]
+        start = self._heads[slot] - self._counts[slot]
+        return self._samples[slot * self.capacity + (start + index) % self.capacity]
+
+    def bounds(self, coin_id):
+        """Lowest and highest held price, or None if there are no samples"""
+        count = self.count(coin_id)
+        if not count:
+            return None
+        low = high = self.get(coin_id, 0)
+        for index in range(1, count):
+            price = self.get(coin_id, index)
+            if price < low:
+                low = price
+            elif price > high:
+                high = price
+        return low, high
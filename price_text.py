@@ -0,0 +1,98 @@
+"""Prices drawn from a sheet of pre-rendered characters, changed tile by tile"""
+
+import displayio
+
+# Everything a price or a change needs, the space last: it is the blank tile
+CHARACTERS = "0123456789$,.+-% "
+
+
+class DigitSheet:
+    """CHARACTERS copied once out of a fixed-width font into one bitmap, a tile each"""
+
+    def __init__(self, font, characters=CHARACTERS):
+        self.tile_width, self.tile_height = font.get_bounding_box()[:2]
+        self.bitmap = displayio.Bitmap(self.tile_width * len(characters), self.tile_height, 2)
+        self.tiles = {}  # Character -> tile index
+        for tile, character in enumerate(characters):
+            self.tiles[character] = tile
+            self._copy_glyph(font.get_glyph(ord(character)), tile * self.tile_width)
+        self.blank = self.tiles[" "]
+
+    def _copy_glyph(self, glyph, left):
+        if glyph is None:
+            return
+        # Glyphs are tiles of the font's bitmap, in rows
+        per_row = glyph.bitmap.width // glyph.width
+        source_x = (glyph.tile_index % per_row) * glyph.width
+        source_y = (glyph.tile_index // per_row) * glyph.height
+        for y in range(min(glyph.height, self.tile_height)):
+            for x in range(min(glyph.width, self.tile_width)):
+                if glyph.bitmap[source_x + x, source_y + y]:
+                    self.bitmap[left + x, y] = 1
+
+
+class PriceText:
+    """A line of up to ``columns`` DigitSheet characters, centered on x, y.
+
+    Setting `text` only writes the tiles whose character changed, so displayio
+    redraws just those cells instead of the whole line. Characters missing from
+    the sheet show blank and text longer than ``columns`` is cut.
+    """
+
+    def __init__(self, sheet, columns, scale, color, x, y, anchor_y=0.5):
+        self._sheet = sheet
+        self.columns = columns
+        self._text = ""
+        self.palette = displayio.Palette(2)
+        self.palette[0] = 0x000000
+        self.palette.make_transparent(0)
+        self.palette[1] = color
+        self.tile_grid = displayio.TileGrid(
+            sheet.bitmap,
+            pixel_shader=self.palette,
+            width=columns,
+            height=1,
+            tile_width=sheet.tile_width,
+            tile_height=sheet.tile_height,
+            default_tile=sheet.blank,
+        )
+        self._cell = sheet.tile_width * scale
+        self._center_x = x
+        self.group = displayio.Group(scale=scale, y=y - int(sheet.tile_height * scale * anchor_y))
+        self.group.append(self.tile_grid)
+        self._place(0)
+
+    def _place(self, length):
+        # Whole cells left of the text, plus half a cell when the padding is odd
+        self.group.x = self._center_x - (self.columns * self._cell) // 2 + (
+            (self.columns - length) % 2) * self._cell // 2
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        text = text[: self.columns]
+        if text == self._text:
+            return
+        if len(text) % 2 != len(self._text) % 2:
+            self._place(len(text))
+        self._text = text
+        start = (self.columns - len(text)) // 2
+        tiles = self._sheet.tiles
+        blank = self._sheet.blank
+        for column in range(self.columns):
+            index = column - start
+            tile = tiles.get(text[index], blank) if 0 <= index < len(text) else blank
+            if self.tile_grid[column] != tile:
+                self.tile_grid[column] = tile
+
+    @property
+    def color(self):
+        return self.palette[1]
+
+    @color.setter
+    def color(self, color):
+        if self.palette[1] != color:
+            self.palette[1] = color
@@ -0,0 +1,51 @@
+"""Coalesces display changes into paced refreshes"""
+
+import time
+
+
+class RefreshCoordinator:
+    """One display refresh per frame, however many changes went into it.
+
+    Code that changes what is on screen calls `invalidate` instead of refreshing;
+    `flush` then calls ``refresh`` once for everything invalidated since the last
+    frame, and not sooner than ``1 / target_fps`` seconds after it. displayio
+    keeps track of the areas that changed, so a frame only sends those.
+
+    Until ``immediate`` is set to False (once something calls `flush` regularly)
+    every `invalidate` refreshes at once, as during boot.
+    """
+
+    def __init__(self, refresh, target_fps=20, clock=time.monotonic):
+        self.refresh = refresh
+        self.interval = 1 / target_fps
+        self.clock = clock
+        self.immediate = True
+        self.dirty = False
+        self.frames = 0
+        self.coalesced = 0  # Invalidations that shared a frame with an earlier one
+        self._last_frame = None
+
+    def invalidate(self):
+        if self.dirty:
+            self.coalesced += 1
+        self.dirty = True
+        if self.immediate:
+            self.flush(force=True)
+
+    def time_until_frame(self):
+        """Seconds until the next frame can go out, None if nothing changed"""
+        if not self.dirty:
+            return None
+        if self._last_frame is None:
+            return 0
+        return max(0, self._last_frame + self.interval - self.clock())
+
+    def flush(self, force=False):
+        """Refreshes if something changed and the frame is due, returns True if it did"""
+        if not self.dirty or (not force and self.time_until_frame() > 0):
+            return False
+        self.dirty = False
+        self._last_frame = self.clock()
+        self.frames += 1
+        self.refresh()
+        return True
@@ -0,0 +1,110 @@
+"""Deadline scheduler for the ticker's periodic and one-shot tasks"""
+
+import time
+
+
+class Scheduler:
+    """Named tasks ordered by deadline in a binary min-heap.
+
+    Scheduling a name that already exists replaces it; replaced and cancelled
+    entries stay in the heap and are skipped when they come up. ``clock`` defaults
+    to ``time.monotonic`` and can be any callable returning seconds, so the
+    scheduler runs on a host with a fake clock.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._heap = []  # (deadline, sequence, name)
+        self._tasks = {}  # name -> [callback, interval or None, sequence]
+        self._sequence = 0
+
+    def _push(self, entry):
+        heap = self._heap
+        heap.append(entry)
+        i = len(heap) - 1
+        while i:
+            parent = (i - 1) // 2
+            if heap[parent] <= entry:
+                break
+            heap[i] = heap[parent]
+            i = parent
+        heap[i] = entry
+
+    def _pop(self):
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        if heap:
+            size = len(heap)
+            i = 0
+            while True:
+                child = 2 * i + 1
+                if child >= size:
+                    break
+                if child + 1 < size and heap[child + 1] < heap[child]:
+                    child += 1
+                if last <= heap[child]:
+                    break
+                heap[i] = heap[child]
+                i = child
+            heap[i] = last
+        return top
+
+    def _schedule(self, name, deadline, callback, interval):
+        self._sequence += 1
+        self._tasks[name] = [callback, interval, self._sequence]
+        self._push((deadline, self._sequence, name))
+
+    def every(self, name, interval, callback, delay=None):
+        """Runs callback every interval seconds, the first time after delay
+        (defaults to interval)"""
+        if delay is None:
+            delay = interval
+        self._schedule(name, self.clock() + delay, callback, interval)
+
+    def after(self, name, delay, callback):
+        """Runs callback once, delay seconds from now"""
+        self._schedule(name, self.clock() + delay, callback, None)
+
+    def cancel(self, name):
+        """Removes the task, returns True if it was scheduled"""
+        return self._tasks.pop(name, None) is not None
+
+    def _is_current(self, entry):
+        task = self._tasks.get(entry[2])
+        return task is not None and task[2] == entry[1]
+
+    def next_deadline(self):
+        """Deadline of the next task, None if nothing is scheduled"""
+        while self._heap and not self._is_current(self._heap[0]):
+            self._pop()
+        return self._heap[0][0] if self._heap else None
+
+    def time_until_next(self):
+        """Seconds until the next task is due (0 if overdue), None if nothing is scheduled"""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0, deadline - self.clock())
+
+    def run_due(self):
+        """Runs every task whose deadline has passed, returns how many ran"""
+        now = self.clock()
+        ran = 0
+        while self._heap and self._heap[0][0] <= now:
+            entry = self._pop()
+            if not self._is_current(entry):
+                continue
+            deadline, _, name = entry
+            callback, interval, _ = self._tasks[name]
+            if interval is None:
+                del self._tasks[name]
+            else:
+                # Keep the period, but don't replay runs missed while busy
+                deadline += interval
+                if deadline <= now:
+                    deadline = now + interval
+                self._schedule(name, deadline, callback, interval)
+            callback()
+            ran += 1
+        return ran
@@ -0,0 +1,120 @@
+"""Coin selection as a bitset over the catalogue, and its on-flash form"""
+
+import json
+import struct
+
+_MAGIC = b"SEL1"
+# Sorts coins without a rank last
+_NO_RANK = 1 << 30
+
+
+class Selection:
+    """Which coins of the catalogue are selected.
+
+    A bitset of catalogue positions answers `is_selected` for the coin under the
+    cursor in O(1). The selected coins themselves are kept by id, so they
+    survive their catalogue page being dropped; a coin selected on an earlier
+    boot is held as just its id until its details are known (`add_coins`).
+    """
+
+    def __init__(self, max_count=20):
+        self.max_count = max_count
+        self._bits = bytearray(0)
+        self._selected = {}  # Coin id -> coin, None while only the id is known
+
+    @property
+    def count(self):
+        """Number of selected coins"""
+        return len(self._selected)
+
+    def reset(self, size, selected_ids):
+        """Starts over for a catalogue of size coins with selected_ids selected"""
+        self._bits = bytearray((size + 7) // 8)
+        self._selected = {}
+        for coin_id in selected_ids[: self.max_count]:
+            self._selected[coin_id] = None
+
+    def add_coins(self, coins, start=None):
+        """Takes in coins (dicts with id/symbol/name/rank): the details of selected
+        ones are kept, and if they are the catalogue positions from start on, their
+        bits are set"""
+        for offset, coin in enumerate(coins):
+            selected = coin["id"] in self._selected
+            if selected:
+                self._selected[coin["id"]] = coin
+            if start is not None:
+                # Positions shift with market caps, clear what a reload moved away
+                position = start + offset
+                if selected:
+                    self._bits[position >> 3] |= 1 << (position & 7)
+                else:
+                    self._bits[position >> 3] &= ~(1 << (position & 7))
+
+    def is_selected(self, position):
+        return bool(self._bits[position >> 3] & (1 << (position & 7)))
+
+    def toggle(self, position, coin):
+        """Flips coin, at catalogue position, returns whether it is now selected.
+        Nothing changes if it would go over max_count."""
+        if self.is_selected(position):
+            self._bits[position >> 3] &= ~(1 << (position & 7))
+            del self._selected[coin["id"]]
+            return False
+        if self.count >= self.max_count:
+            return False
+        self._bits[position >> 3] |= 1 << (position & 7)
+        self._selected[coin["id"]] = coin
+        return True
+
+    def selected_coins(self):
+        """Selected coins whose details are known, by market cap rank"""
+        coins = [coin for coin in self._selected.values() if coin is not None]
+        coins.sort(key=lambda coin: coin.get("rank") or _NO_RANK)
+        return coins
+
+    def selected_ids(self):
+        """Every selected id, including those still waiting for details"""
+        return list(self._selected)
+
+
+def save_ids(path, coin_ids):
+    """Writes coin_ids as: 4s magic, H count, then B length + utf-8 id per coin.
+
+    Ids rather than positions are stored since the catalogue order changes
+    with market caps between boots."""
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sH", _MAGIC, len(coin_ids)))
+        for coin_id in coin_ids:
+            encoded = coin_id.encode("utf-8")[:255]
+            f.write(struct.pack("<B", len(encoded)))
+            f.write(encoded)
+
+
+def load_ids(path, legacy_json_path=None):
+    """Reads ids written by save_ids. If there is no such file but legacy_json_path
+    holds the old JSON list, that one is migrated to path, or only read if path
+    can't be written (CIRCUITPY is read-only to code without a boot.py remount)."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        if legacy_json_path is None:
+            raise
+        with open(legacy_json_path, "r") as f:
+            coin_ids = json.load(f)
+        try:
+            save_ids(path, coin_ids)
+        except OSError:
+            pass
+        return coin_ids
+
+    magic, count = struct.unpack_from("<4sH", data, 0)
+    if magic != _MAGIC:
+        raise ValueError("Unknown selection format")
+    offset = 6
+    coin_ids = []
+    for _ in range(count):
+        length = data[offset]
+        coin_ids.append(str(data[offset + 1:offset + 1 + length], "utf-8"))
+        offset += 1 + length
+    return coin_ids
@@ -0,0 +1,156 @@
+"""Headless host simulator for the ticker.
+
+Runs the unmodified code.py on CPython with stand-ins for the CircuitPython
+modules it imports (board, displayio, fontio, keypad, supervisor, terminalio, wifi,
+socketpool), a virtual clock behind ``time`` and ``asyncio``, and a temporary
+directory in place of the CIRCUITPY drive. Button presses are scripted, so hours of ticker
+time run in seconds and every run is repeatable::
+
+    from sim import Simulator
+
+    simulator = Simulator(hosts={"api.coingecko.com": ("127.0.0.1", 8000)})
+    simulator.press(1, at=20, hold=6)  # Long press BUTTON1: confirm selection
+    print(simulator.run(hours=4))
+
+or ``python -m sim --help``.
+"""
+
+import asyncio
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+
+from sim import clock as _clock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported by their CircuitPython names, in this order (terminalio needs displayio
+# and fontio, board needs displayio)
+_MODULES = ("displayio", "fontio", "terminalio", "keypad", "wifi", "socketpool", "supervisor", "board")
+
+_wall_clock = time.perf_counter
+
+
+class Simulator:
+    """One simulated device: a display, buttons, a clock and a flash drive.
+
+    ``hosts`` is passed to the socketpool stand-in (host -> (address, port)).
+    ``flash_dir`` stands in for the drive's root, a new temporary directory by
+    default. With ``quiet`` the app's prints are swallowed. With ``real_time``
+    the app runs on the wall clock instead of the virtual one, presses are
+    then at real seconds since boot: for measuring what blocks, as waiting on
+    a socket takes no virtual time.
+    """
+
+    def __init__(self, hosts=None, flash_dir=None, width=320, height=170, quiet=True,
+                 real_time=False):
+        self.hosts = hosts or {}
+        self.flash_dir = flash_dir or tempfile.mkdtemp(prefix="cryptoticker-")
+        self.width = width
+        self.height = height
+        self.quiet = quiet
+        self.real_time = real_time
+        self.clock = _clock.VirtualClock()
+        self.modules = {}
+        self.display = None
+        self.ticker = None
+        self.wall_time = 0.0
+        self._saved_modules = {}
+        self._saved_policy = None
+        self._presses = []
+
+    def press(self, key_number, at, hold=0.1):
+        """Presses button key_number at seconds since boot, for hold seconds"""
+        self._presses.append((key_number, at, hold))
+
+    def install(self):
+        """Puts the stand-ins, the virtual clock and the loop policy in place"""
+        for path in (os.path.join(ROOT, "lib"), ROOT):
+            if path not in sys.path:
+                sys.path.insert(0, path)
+        for name in _MODULES:
+            self._saved_modules[name] = sys.modules.get(name)
+            module = importlib.import_module(f"sim.{name}")
+            sys.modules[name] = module
+            self.modules[name] = module
+
+        self.display = self.modules["displayio"].Display(self.width, self.height)
+        self.modules["board"].DISPLAY = self.display
+        self.modules["socketpool"].hosts = dict(self.hosts)
+        self.modules["socketpool"].poll_wait = 0 if self.real_time else 0.05
+        self.modules["socketpool"].reset_stats()
+        keypad = self.modules["keypad"]
+        keypad.clear()
+        for key_number, at, hold in self._presses:
+            keypad.press(key_number, at, hold)
+
+        self._saved_policy = asyncio.get_event_loop_policy()
+        if self.real_time:
+            keypad.epoch = time.monotonic()
+            until = keypad.epoch + (self.clock.until or 0)
+            asyncio.set_event_loop_policy(_clock.WallClockPolicy(until))
+        else:
+            keypad.epoch = 0.0
+            _clock.install(self.clock)
+            asyncio.set_event_loop_policy(_clock.EventLoopPolicy(self.clock))
+
+    def uninstall(self):
+        asyncio.set_event_loop_policy(self._saved_policy)
+        if not self.real_time:
+            _clock.uninstall()
+        for name, module in self._saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def load_app(self):
+        """Imports a fresh copy of code.py, with its flash paths moved into flash_dir"""
+        spec = importlib.util.spec_from_file_location("cryptoticker_app", os.path.join(ROOT, "code.py"))
+        app = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(app)
+        for name, value in vars(app).items():
+            if name.endswith(("_PATH", "_DIR")) and isinstance(value, str) and value.startswith("/"):
+                setattr(app, name, os.path.join(self.flash_dir, value.lstrip("/")))
+        return app
+
+    def run(self, hours=1.0):
+        """Boots the app and runs it for hours of virtual time (real time with
+        ``real_time``, boot included), returns `report`"""
+        self.clock.until = self.clock.now + hours * 3600
+        output = io.StringIO() if self.quiet else sys.stdout
+        started = _wall_clock()
+        with self, contextlib.redirect_stdout(output):
+            app = self.load_app()
+            self.ticker = app.CryptoTicker()
+            try:
+                self.ticker.run()
+            except _clock.SimulationDone:
+                pass
+        self.wall_time = _wall_clock() - started
+        return self.report()
+
+    def report(self):
+        display = self.display
+        stats = self.modules["socketpool"].stats
+        return {
+            "simulated_s": self.clock.now,
+            "wall_s": self.wall_time,
+            "refreshes": display.refresh_count,
+            "frames": display.frame_count,
+            "dirty_pixels": display.dirty_pixels,
+            "connects": stats["connects"],
+            "bytes_sent": stats["bytes_sent"],
+            "bytes_received": stats["bytes_received"],
+        }
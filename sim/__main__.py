@@ -0,0 +1,47 @@
+"""Command line for the simulator, e.g.
+
+    python -m sim --hours 8 --host api.coingecko.com=127.0.0.1:8000 --press 1@20+6
+"""
+
+import argparse
+
+from sim import Simulator
+
+
+def _host(value):
+    name, _, target = value.partition("=")
+    address, _, port = target.rpartition(":")
+    return name, (address, int(port))
+
+
+def _press(value):
+    """KEY@AT[+HOLD], seconds since boot"""
+    key, _, rest = value.partition("@")
+    at, _, hold = rest.partition("+")
+    return int(key), float(at), float(hold or 0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m sim", description="Run code.py headless on a virtual clock")
+    parser.add_argument("--hours", type=float, default=1.0, help="virtual time to run for")
+    parser.add_argument("--host", type=_host, action="append", default=[], metavar="NAME=ADDRESS:PORT",
+                        help="connect to ADDRESS:PORT instead of NAME")
+    parser.add_argument("--press", type=_press, action="append", default=[], metavar="KEY@AT[+HOLD]",
+                        help="press button KEY at AT seconds for HOLD seconds")
+    parser.add_argument("--flash", help="directory standing in for the CIRCUITPY drive")
+    parser.add_argument("--screenshot", help="write the last frame to this PPM file")
+    parser.add_argument("--verbose", action="store_true", help="show the app's output")
+    args = parser.parse_args()
+
+    simulator = Simulator(hosts=dict(args.host), flash_dir=args.flash, quiet=not args.verbose)
+    for key, at, hold in args.press:
+        simulator.press(key, at, hold)
+    report = simulator.run(hours=args.hours)
+    for name, value in report.items():
+        print(f"{name:<16} {value:,.2f}" if isinstance(value, float) else f"{name:<16} {value:,}")
+    if args.screenshot:
+        simulator.display.save_ppm(args.screenshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""board stand-in for the T-Display-S3. DISPLAY is replaced by the simulator."""
+
+import displayio
+
+
+class Pin:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"board.{self.name}"
+
+
+BUTTON0 = Pin("BUTTON0")
+BUTTON1 = Pin("BUTTON1")
+DISPLAY = displayio.Display(320, 170)
@@ -0,0 +1,133 @@
+"""Virtual time for the simulator.
+
+`install` points ``time.monotonic``, ``time.time`` and ``time.sleep`` at a
+`VirtualClock`, and `EventLoopPolicy` gives ``asyncio.run`` a loop whose
+selector advances that clock instead of waiting. Hours of the ticker's timers
+then pass as fast as the code between them runs.
+"""
+
+import asyncio
+import math
+import selectors
+import time
+
+# The real functions, for restoring and for measuring wall time
+_real = {"monotonic": time.monotonic, "time": time.time, "sleep": time.sleep}
+
+
+class SimulationDone(Exception):
+    """Raised out of the event loop once the clock reaches the end of the run"""
+
+
+class VirtualClock:
+    """Seconds since boot that only move when something waits"""
+
+    def __init__(self, epoch=1_700_000_000):
+        self.now = 0.0
+        self.epoch = epoch  # time.time() at boot
+        self.until = None  # End of the run, set by the simulator
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.epoch + self.now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        # Always move at least a little, a timer is only due once the clock is past it
+        self.now = max(self.now + seconds, math.nextafter(self.now, math.inf))
+
+    @property
+    def expired(self):
+        return self.until is not None and self.now >= self.until
+
+
+def install(clock):
+    time.monotonic = clock.monotonic
+    time.time = clock.time
+    time.sleep = clock.sleep
+
+
+def uninstall():
+    for name, function in _real.items():
+        setattr(time, name, function)
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    """Polls the real file descriptors without blocking, then moves the clock to
+    the loop's next timer instead of sleeping until it"""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+        self.done = False
+
+    def _finish(self, reason):
+        self.done = True
+        raise SimulationDone(reason)
+
+    def select(self, timeout=None):
+        if self.done:
+            # Shutting down after the run, let the loop finish normally
+            return super().select(timeout)
+        events = super().select(0)
+        if events:
+            return events
+        if timeout == 0:
+            # Callbacks are ready or a timer is due right now, the nudge makes it due
+            self.clock.advance(0)
+            return events
+        if timeout is None:
+            self._finish("Nothing left to wait for")
+        self.clock.advance(timeout)
+        if self.clock.expired:
+            self.clock.now = self.clock.until
+            self._finish(f"Simulated {self.clock.until:.0f} seconds")
+        return events
+
+
+class DeadlineSelector(selectors.DefaultSelector):
+    """Waits in real time, but not past until (a real time.monotonic())"""
+
+    def __init__(self, until):
+        super().__init__()
+        self.until = until
+        self.done = False
+
+    def select(self, timeout=None):
+        if self.done:
+            return super().select(timeout)
+        remaining = self.until - _real["monotonic"]()
+        if remaining <= 0:
+            self.done = True
+            raise SimulationDone("Out of real time")
+        if timeout is None or timeout > remaining:
+            timeout = remaining
+        return super().select(timeout)
+
+
+class WallClockPolicy(asyncio.DefaultEventLoopPolicy):
+    """Event loops on the real clock that end the run at until"""
+
+    def __init__(self, until):
+        super().__init__()
+        self.until = until
+
+    def new_event_loop(self):
+        return asyncio.SelectorEventLoop(DeadlineSelector(self.until))
+
+
+class EventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def new_event_loop(self):
+        loop = asyncio.SelectorEventLoop(VirtualSelector(self.clock))
+        # Timers within the resolution would count as due without the clock
+        # getting to them, leaving the app's own deadlines unreached
+        loop._clock_resolution = 0
+        return loop
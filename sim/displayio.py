@@ -0,0 +1,384 @@
+"""displayio stand-in: Group, TileGrid, Bitmap and Palette, plus a framebuffer Display.
+
+Every change to a layer, bitmap or palette bumps a generation counter, so a
+refresh with nothing changed costs nothing. Otherwise the whole tree is drawn
+into a new frame and compared with the last one to count dirty pixels.
+"""
+
+from array import array
+
+_generation = 0
+
+
+def _touch():
+    global _generation
+    _generation += 1
+
+
+class _Layer:
+    """Counts any attribute change as a change on screen"""
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        _touch()
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self._version = 0
+        if value_count <= 256:
+            self._data = bytearray(width * height)
+        else:
+            self._data = array("H", [0] * (width * height))
+
+    def _index(self, index):
+        if isinstance(index, tuple):
+            x, y = index
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel coordinates out of bounds")
+            return y * self.width + x
+        return index
+
+    def __getitem__(self, index):
+        return self._data[self._index(index)]
+
+    def __setitem__(self, index, value):
+        if not 0 <= value < self.value_count:
+            raise ValueError("value out of range")
+        self._data[self._index(index)] = value
+        self._version += 1
+        _touch()
+
+    def fill(self, value):
+        for i in range(len(self._data)):
+            self._data[i] = value
+        self._version += 1
+        _touch()
+
+
+class Palette:
+    def __init__(self, color_count, *, dither=False):
+        self._colors = [0] * color_count
+        self._transparent = [False] * color_count
+        self._version = 0
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, color):
+        if isinstance(color, (tuple, list, bytes, bytearray)):
+            color = (color[0] << 16) | (color[1] << 8) | color[2]
+        self._colors[index] = color
+        self._version += 1
+        _touch()
+
+    def make_transparent(self, index):
+        self._transparent[index] = True
+        self._version += 1
+        _touch()
+
+    def make_opaque(self, index):
+        self._transparent[index] = False
+        self._version += 1
+        _touch()
+
+    def is_transparent(self, index):
+        return self._transparent[index]
+
+    def _shades(self):
+        """Color per value, None where transparent"""
+        return [None if transparent else color for color, transparent in zip(self._colors, self._transparent)]
+
+
+class TileGrid(_Layer):
+    def __init__(
+        self,
+        bitmap,
+        *,
+        pixel_shader,
+        width=1,
+        height=1,
+        tile_width=None,
+        tile_height=None,
+        default_tile=0,
+        x=0,
+        y=0,
+    ):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = bitmap.width if tile_width is None else tile_width
+        self.tile_height = bitmap.height if tile_height is None else tile_height
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self.flip_x = False
+        self.flip_y = False
+        self.transpose_xy = False
+        self._tiles = [default_tile] * (width * height)
+        self._in_group = False
+
+    def _index(self, index):
+        if isinstance(index, tuple):
+            return index[1] * self.width + index[0]
+        return index
+
+    def __getitem__(self, index):
+        return self._tiles[self._index(index)]
+
+    def __setitem__(self, index, tile):
+        self._tiles[self._index(index)] = tile
+        _touch()
+
+
+class Group(_Layer):
+    # Kept apart from the properties like in the native class: subclasses such as
+    # adafruit_display_text's labels override scale
+    def __init__(self, *, scale=1, x=0, y=0):
+        self._scale = scale
+        self._x = x
+        self._y = y
+        self.hidden = False
+        self._layers = []
+        self._in_group = False
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale):
+        self._scale = scale
+        _touch()
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._x = x
+        _touch()
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        self._y = y
+        _touch()
+
+    def _adopt(self, layer):
+        # Like on the device: a layer can only be shown in one place
+        if layer._in_group:
+            raise ValueError("Layer already in a group")
+        layer._in_group = True
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __getitem__(self, index):
+        return self._layers[index]
+
+    def __setitem__(self, index, layer):
+        old = self._layers[index]
+        if old is layer:
+            return
+        self._adopt(layer)
+        old._in_group = False
+        self._layers[index] = layer
+        _touch()
+
+    def __delitem__(self, index):
+        self.pop(index)
+
+    def __contains__(self, layer):
+        return layer in self._layers
+
+    def append(self, layer):
+        self.insert(len(self._layers), layer)
+
+    def insert(self, index, layer):
+        self._adopt(layer)
+        self._layers.insert(index, layer)
+        _touch()
+
+    def index(self, layer):
+        return self._layers.index(layer)
+
+    def pop(self, index=-1):
+        layer = self._layers.pop(index)
+        layer._in_group = False
+        _touch()
+        return layer
+
+    def remove(self, layer):
+        self.pop(self._layers.index(layer))
+
+
+class Display:
+    """Draws root_group into a framebuffer of 0xRRGGBB ints on every refresh.
+
+    ``refresh_count`` counts refresh() calls, ``frame_count`` the ones that had
+    something to draw, ``dirty_pixels`` the pixels changed over all frames and
+    ``last_dirty`` those changed by the last one. A rotation change counts as
+    redrawing the whole panel. ``auto_refresh`` starts True as on the board,
+    though only explicit refreshes are drawn here.
+    """
+
+    def __init__(self, width=320, height=170):
+        self.width = width
+        self.height = height
+        self.auto_refresh = True
+        self.brightness = 1.0
+        self.refresh_count = 0
+        self.frame_count = 0
+        self.dirty_pixels = 0
+        self.last_dirty = 0
+        self._root_group = None
+        self._rotation = 0
+        self._rotated = False
+        self._generation = -1
+        self._frame = [[0] * width for _ in range(height)]
+        self._tiles = {}  # Prepared tiles, see _draw_tile_grid
+
+    @property
+    def root_group(self):
+        return self._root_group
+
+    @root_group.setter
+    def root_group(self, group):
+        self._root_group = group
+        _touch()
+
+    @property
+    def rotation(self):
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, rotation):
+        if rotation != self._rotation:
+            self._rotation = rotation
+            self._rotated = True
+
+    def pixel(self, x, y):
+        """Color at x, y of the last frame, before rotation"""
+        return self._frame[y][x]
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        self.refresh_count += 1
+        if self._generation == _generation and not self._rotated:
+            self.last_dirty = 0
+            return True
+        self._generation = _generation
+        frame = [[0] * self.width for _ in range(self.height)]
+        if self._root_group is not None:
+            if len(self._tiles) > 4096:
+                self._tiles = {}
+            self._draw(frame, self._root_group, 0, 0, 1, self._tiles)
+
+        if self._rotated:
+            dirty = self.width * self.height
+            self._rotated = False
+        else:
+            dirty = 0
+            for old, new in zip(self._frame, frame):
+                if old != new:
+                    dirty += sum(1 for a, b in zip(old, new) if a != b)
+        self._frame = frame
+        self.frame_count += 1
+        self.last_dirty = dirty
+        self.dirty_pixels += dirty
+        return True
+
+    def _draw(self, frame, layer, x, y, scale, tiles):
+        if layer.hidden:
+            return
+        if isinstance(layer, Group):
+            x += layer._x * scale
+            y += layer._y * scale
+            scale *= layer._scale
+            for child in layer._layers:
+                self._draw(frame, child, x, y, scale, tiles)
+        else:
+            self._draw_tile_grid(frame, layer, x + layer.x * scale, y + layer.y * scale, scale, tiles)
+
+    @staticmethod
+    def _tile_rows(grid, tile, scale):
+        """The tile's rows as lists of (offset, colors) opaque runs, scaled"""
+        bitmap = grid.bitmap
+        shades = grid.pixel_shader._shades()
+        width = grid.tile_width
+        height = grid.tile_height
+        per_row = bitmap.width // width
+        left = (tile % per_row) * width
+        top = (tile // per_row) * height
+        rows = []
+        for row in range(height):
+            line = top + (height - 1 - row if grid.flip_y else row)
+            start = line * bitmap.width + left
+            colors = [shades[value] for value in bitmap._data[start : start + width]]
+            if grid.flip_x:
+                colors.reverse()
+            if scale > 1:
+                colors = [color for color in colors for _ in range(scale)]
+            runs = []
+            run_start = None
+            for i, color in enumerate(colors + [None]):
+                if color is None and run_start is not None:
+                    runs.append((run_start, colors[run_start:i]))
+                    run_start = None
+                elif color is not None and run_start is None:
+                    run_start = i
+            rows.append(runs)
+        return rows
+
+    def _draw_tile_grid(self, frame, grid, x, y, scale, tiles):
+        # Tiles are prepared once and reused until their bitmap or palette
+        # changes. The objects are part of the key so their ids can't be reused.
+        bitmap = grid.bitmap
+        palette = grid.pixel_shader
+        key_base = (bitmap, bitmap._version, palette, palette._version, grid.tile_width,
+                    grid.tile_height, grid.flip_x, grid.flip_y, scale)
+        for tile_y in range(grid.height):
+            for tile_x in range(grid.width):
+                tile = grid._tiles[tile_y * grid.width + tile_x]
+                key = key_base + (tile,)
+                rows = tiles.get(key)
+                if rows is None:
+                    rows = tiles[key] = self._tile_rows(grid, tile, scale)
+                left = x + tile_x * grid.tile_width * scale
+                top = y + tile_y * grid.tile_height * scale
+                for row, runs in enumerate(rows):
+                    if not runs:
+                        continue
+                    for repeat in range(scale):
+                        target = top + row * scale + repeat
+                        if 0 <= target < self.height:
+                            line = frame[target]
+                            for offset, colors in runs:
+                                self._blit(line, left + offset, colors)
+
+    def _blit(self, line, left, colors):
+        if left >= 0 and left + len(colors) <= self.width:
+            line[left : left + len(colors)] = colors
+            return
+        start = max(0, -left)
+        end = min(len(colors), self.width - left)
+        if start < end:
+            line[left + start : left + end] = colors[start:end]
+
+    def save_ppm(self, path):
+        """Writes the last frame as a binary PPM image, for looking at it"""
+        with open(path, "wb") as f:
+            f.write(b"P6 %d %d 255\n" % (self.width, self.height))
+            for line in self._frame:
+                f.write(bytes(channel for color in line for channel in color.to_bytes(3, "big")))
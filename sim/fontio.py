@@ -0,0 +1,18 @@
+"""fontio stand-in: the Glyph tuple and the protocol adafruit_display_text annotates with"""
+
+from collections import namedtuple
+
+try:
+    from typing import Protocol
+except ImportError:
+    Protocol = object
+
+Glyph = namedtuple("Glyph", ("bitmap", "tile_index", "width", "height", "dx", "dy", "shift_x", "shift_y"))
+
+
+class FontProtocol(Protocol):
+    def get_bounding_box(self):
+        ...
+
+    def get_glyph(self, codepoint):
+        ...
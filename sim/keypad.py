@@ -0,0 +1,80 @@
+"""keypad stand-in. Key events come from a script instead of pins: `press` queues
+them at virtual times and every Keys.events hands them out once they are due.
+`delivered` records when each one was, to measure input latency."""
+
+import time
+
+_script = []  # (at, key_number, pressed), kept sorted
+delivered = []  # (due, handed out) per event, seconds since boot
+epoch = 0.0  # time.monotonic() at boot, for a simulator on the wall clock
+
+
+def _now():
+    return time.monotonic() - epoch
+
+
+def press(key_number, at, hold=0.1):
+    """Presses key_number at (seconds since boot) and releases it hold seconds later"""
+    _script.append((at, key_number, True))
+    _script.append((at + hold, key_number, False))
+    _script.sort(key=lambda event: event[0])
+
+
+def clear():
+    del _script[:]
+    del delivered[:]
+
+
+class Event:
+    def __init__(self, key_number=0, pressed=True, timestamp=None):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.released = not pressed
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"<Event: key_number {self.key_number} {'pressed' if self.pressed else 'released'}>"
+
+
+class EventQueue:
+    def __init__(self):
+        self.overflowed = False
+
+    def _due(self):
+        return _script and _script[0][0] <= _now()
+
+    def __len__(self):
+        now = _now()
+        return sum(1 for event in _script if event[0] <= now)
+
+    def __bool__(self):
+        return bool(self._due())
+
+    def get_into(self, event):
+        if not self._due():
+            return False
+        at, event.key_number, event.pressed = _script.pop(0)
+        delivered.append((at, _now()))
+        event.released = not event.pressed
+        event.timestamp = int(at * 1000)
+        return True
+
+    def get(self):
+        event = Event()
+        return event if self.get_into(event) else None
+
+    def clear(self):
+        while self._due():
+            _script.pop(0)
+
+
+class Keys:
+    def __init__(self, pins, *, value_when_pressed, pull=True, interval=0.02, max_events=64):
+        self.key_count = len(pins)
+        self.events = EventQueue()
+
+    def reset(self):
+        pass
+
+    def deinit(self):
+        pass
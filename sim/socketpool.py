@@ -0,0 +1,114 @@
+"""socketpool stand-in over CPython sockets.
+
+``hosts`` maps a host name (or ``(host, port)``) to the ``(address, port)``
+really connected to, e.g. a local fixture server in place of CoinGecko.
+Errors are raised the way CircuitPython raises them: ``OSError`` with
+``EAGAIN`` when a non-blocking call would block, ``ETIMEDOUT`` on timeouts.
+``stats`` counts connections and bytes over all sockets.
+"""
+
+import errno
+import select
+import socket as _socket
+
+hosts = {}
+stats = {"connects": 0, "bytes_sent": 0, "bytes_received": 0}
+
+# A non-blocking read waits this long (real seconds) for data before it reports
+# EAGAIN, otherwise the virtual clock would race through a request's timeout
+# while the real server is still answering. 0 on the wall clock.
+poll_wait = 0.05
+
+
+def _error(code):
+    # errno is only set from the arguments on CPython with a message too
+    return OSError(code, errno.errorcode[code])
+
+
+def reset_stats():
+    for key in stats:
+        stats[key] = 0
+
+
+class Socket:
+    def __init__(self, family, type, proto):
+        self._socket = _socket.socket(family, type, proto)
+        self._timeout = None
+
+    def settimeout(self, timeout):
+        self._timeout = timeout
+        self._socket.settimeout(timeout)
+
+    def setsockopt(self, level, optname, value):
+        self._socket.setsockopt(level, optname, value)
+
+    def connect(self, address):
+        host, port = address
+        target = hosts.get((host, port)) or hosts.get(host) or (host, port)
+        try:
+            self._socket.connect(target)
+        except _socket.timeout as exc:
+            raise _error(errno.ETIMEDOUT) from exc
+        stats["connects"] += 1
+
+    def send(self, data):
+        try:
+            sent = self._socket.send(data)
+        except BlockingIOError as exc:
+            raise _error(errno.EAGAIN) from exc
+        except _socket.timeout as exc:
+            raise _error(errno.ETIMEDOUT) from exc
+        stats["bytes_sent"] += sent
+        return sent
+
+    def recv_into(self, buffer, nbytes=0):
+        if self._timeout == 0:
+            readable, _, _ = select.select([self._socket], [], [], poll_wait)
+            if not readable:
+                raise _error(errno.EAGAIN)
+        try:
+            received = self._socket.recv_into(buffer, nbytes)
+        except BlockingIOError as exc:
+            raise _error(errno.EAGAIN) from exc
+        except _socket.timeout as exc:
+            raise _error(errno.ETIMEDOUT) from exc
+        stats["bytes_received"] += received
+        return received
+
+    def recv(self, bufsize):
+        buffer = bytearray(bufsize)
+        received = self.recv_into(buffer, bufsize)
+        return bytes(buffer[:received])
+
+    def close(self):
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SocketPool:
+    AF_INET = _socket.AF_INET
+    SOCK_STREAM = _socket.SOCK_STREAM
+    SOCK_DGRAM = _socket.SOCK_DGRAM
+    IPPROTO_TCP = _socket.IPPROTO_TCP
+    SOL_SOCKET = _socket.SOL_SOCKET
+    SO_REUSEADDR = _socket.SO_REUSEADDR
+    TCP_NODELAY = _socket.TCP_NODELAY
+    EAGAIN = errno.EAGAIN
+    EINPROGRESS = errno.EINPROGRESS
+    timeout = OSError
+    gaierror = OSError
+
+    def __init__(self, radio):
+        self.radio = radio
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        # The name is kept as the address, Socket.connect looks it up in hosts
+        return [(self.AF_INET, self.SOCK_STREAM, self.IPPROTO_TCP, "", (host, port))]
+
+    def socket(self, family=AF_INET, type=SOCK_STREAM, proto=IPPROTO_TCP):
+        return Socket(family, type, proto)
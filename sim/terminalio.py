@@ -0,0 +1,42 @@
+"""terminalio stand-in: a 6x12 FONT with made-up glyphs.
+
+The glyph shapes are derived from the character code, so different text
+changes different pixels like the real font would, without shipping one.
+"""
+
+import displayio
+from fontio import Glyph
+
+_WIDTH = 6
+_HEIGHT = 12
+_FIRST = 0x20
+_LAST = 0x7E
+
+
+class _Font:
+    def __init__(self):
+        count = _LAST - _FIRST + 1
+        self.bitmap = displayio.Bitmap(_WIDTH * count, _HEIGHT, 2)
+        for code in range(_FIRST + 1, _LAST + 1):
+            pattern = (code * 2654435761) & 0xFFFFFFFFFF
+            left = (code - _FIRST) * _WIDTH
+            # 5x8 cell between the ascender and descender rows
+            for bit in range(40):
+                if pattern >> bit & 1:
+                    self.bitmap[left + bit % 5, 2 + bit // 5] = 1
+        self._glyphs = {}
+
+    def get_bounding_box(self):
+        return (_WIDTH, _HEIGHT)
+
+    def get_glyph(self, codepoint):
+        if not _FIRST <= codepoint <= _LAST:
+            codepoint = ord("?")
+        glyph = self._glyphs.get(codepoint)
+        if glyph is None:
+            glyph = Glyph(self.bitmap, codepoint - _FIRST, _WIDTH, _HEIGHT, 0, -2, _WIDTH, 0)
+            self._glyphs[codepoint] = glyph
+        return glyph
+
+
+FONT = _Font()
@@ -0,0 +1,20 @@
+"""wifi stand-in, connecting takes connect_time seconds of virtual time"""
+
+import time
+
+
+class Radio:
+    def __init__(self):
+        self.enabled = True
+        self.connected = False
+        self.ipv4_address = None
+        self.hostname = "cryptoticker"
+        self.connect_time = 2.0
+
+    def connect(self, ssid, password="", *, channel=0, bssid=None, timeout=None):
+        time.sleep(self.connect_time)
+        self.connected = True
+        self.ipv4_address = "127.0.0.1"
+
+
+radio = Radio()
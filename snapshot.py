@@ -0,0 +1,84 @@
+"""Compact binary snapshot of the coin list and last prices, for warm boots.
+
+Layout (little endian)::
+
+    header  4s magic, B version, B coin count, I saved at (time.time())
+    coin    B flags, B id length, B symbol length, B name length, then the utf-8
+            id, symbol and name, then f usd, f 24h change, I last_updated_at
+"""
+
+import struct
+
+_MAGIC = b"CTKR"
+_VERSION = 1
+_HEADER = "<4sBBI"
+_COIN = "<BBBB"
+_PRICE = "<ffI"
+_SELECTED = 0x01
+_HAS_PRICE = 0x02
+
+
+def save(path, coins, selected_ids, prices, saved_at):
+    """Writes coins (dicts with id/symbol/name), which of them are selected and their
+    prices (the /simple/price dict) to path"""
+    with open(path, "wb") as f:
+        f.write(struct.pack(_HEADER, _MAGIC, _VERSION, len(coins), int(saved_at)))
+        for coin in coins:
+            coin_id = coin["id"].encode("utf-8")[:255]
+            symbol = coin["symbol"].encode("utf-8")[:255]
+            name = coin["name"].encode("utf-8")[:255]
+            price = prices.get(coin["id"])
+            flags = _SELECTED if coin["id"] in selected_ids else 0
+            if price and "usd" in price:
+                flags |= _HAS_PRICE
+            f.write(struct.pack(_COIN, flags, len(coin_id), len(symbol), len(name)))
+            f.write(coin_id)
+            f.write(symbol)
+            f.write(name)
+            if flags & _HAS_PRICE:
+                f.write(struct.pack(
+                    _PRICE,
+                    price["usd"],
+                    price.get("usd_24h_change", 0) or 0,
+                    price.get("last_updated_at", 0) or 0,
+                ))
+
+
+def load(path):
+    """Reads a snapshot back as (coins, selected_ids, prices, saved_at), raises
+    OSError if there is none and ValueError (struct.error on CPython) if it is unreadable"""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, count, saved_at = struct.unpack_from(_HEADER, data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Unknown snapshot format")
+    offset = struct.calcsize(_HEADER)
+    coin_size = struct.calcsize(_COIN)
+    price_size = struct.calcsize(_PRICE)
+
+    coins = []
+    selected_ids = []
+    prices = {}
+    for _ in range(count):
+        flags, id_length, symbol_length, name_length = struct.unpack_from(_COIN, data, offset)
+        offset += coin_size
+        coin_id = str(data[offset:offset + id_length], "utf-8")
+        offset += id_length
+        symbol = str(data[offset:offset + symbol_length], "utf-8")
+        offset += symbol_length
+        name = str(data[offset:offset + name_length], "utf-8")
+        offset += name_length
+        coins.append({"id": coin_id, "symbol": symbol, "name": name, "color": 0x00FF00})
+        if flags & _SELECTED:
+            selected_ids.append(coin_id)
+        if flags & _HAS_PRICE:
+            usd, change, updated_at = struct.unpack_from(_PRICE, data, offset)
+            offset += price_size
+            prices[coin_id] = {
+                "usd": usd,
+                "usd_24h_change": change,
+                "last_updated_at": updated_at,
+            }
+    if offset != len(data):
+        raise ValueError("Truncated or corrupt snapshot")
+    return coins, selected_ids, prices, saved_at
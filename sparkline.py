@@ -0,0 +1,93 @@
+"""Sparkline of a coin's PriceHistory that scrolls without redrawing"""
+
+import displayio
+
+
+class Sparkline:
+    """Line chart of coin_id's history, one bitmap column per sample, newest on the right.
+
+    Each bitmap column is a tile and the tile grid maps screen columns onto
+    bitmap columns as a ring, so a new sample only draws the column it replaces
+    and rotates the tile indices. A change of the price range (which rescales
+    the chart) redraws everything. At 1 bit per pixel a chart of 120 samples
+    16 pixels high is 240 bytes, so each coin screen has its own.
+    """
+
+    def __init__(self, history, coin_id, height, x=0, y=0):
+        self._history = history
+        self._coin_id = coin_id
+        self._width = history.capacity
+        self._height = height
+        self._bitmap = displayio.Bitmap(self._width, height, 2)
+        self.palette = displayio.Palette(2)
+        self.palette[0] = 0x000000
+        self.palette.make_transparent(0)
+        self.palette[1] = 0x00FF00
+        self.tile_grid = displayio.TileGrid(
+            self._bitmap,
+            pixel_shader=self.palette,
+            width=self._width,
+            height=1,
+            tile_width=1,
+            tile_height=height,
+            x=x,
+            y=y,
+        )
+        self._offset = 0  # Bitmap column shown at the left edge
+        self._total = 0
+        self._bounds = None
+
+    def _y(self, price):
+        low, high = self._bounds
+        if high <= low:
+            return self._height // 2
+        return self._height - 1 - int((price - low) * (self._height - 1) / (high - low))
+
+    def _draw_column(self, column, index):
+        """Draws sample index into bitmap column"""
+        bitmap = self._bitmap
+        for y in range(self._height):
+            bitmap[column, y] = 0
+        y = self._y(self._history.get(self._coin_id, index))
+        previous = self._y(self._history.get(self._coin_id, index - 1)) if index else y
+        for y in range(min(y, previous), max(y, previous) + 1):
+            bitmap[column, y] = 1
+
+    def _set_tiles(self):
+        for x in range(self._width):
+            self.tile_grid[x] = (self._offset + x) % self._width
+
+    def _redraw(self):
+        self._bitmap.fill(0)
+        self._offset = 0
+        count = self._history.count(self._coin_id)
+        first_column = self._width - count
+        for index in range(count):
+            self._draw_column(first_column + index, index)
+        self._set_tiles()
+
+    def update(self):
+        """Brings the chart up to date with the samples added since the last update"""
+        coin_id = self._coin_id
+        total = self._history.total(coin_id)
+        if total == self._total:
+            return
+        bounds = self._history.bounds(coin_id)
+        added = total - self._total
+        scroll = 0 < added < self._width and self._total and bounds == self._bounds
+        self._total = total
+        self._bounds = bounds
+
+        count = self._history.count(coin_id)
+        if count:
+            rising = self._history.get(coin_id, count - 1) >= self._history.get(coin_id, 0)
+            self.palette[1] = 0x00FF00 if rising else 0xFF0000
+
+        if scroll:
+            # The leftmost columns become the newest ones
+            for index in range(count - added, count):
+                self._draw_column(self._offset, index)
+                self._offset = (self._offset + 1) % self._width
+            self._set_tiles()
+        else:
+            self._redraw()